@@ -18,7 +18,9 @@ Usage::
 
 __version__ = '1.0.1'
 
-from . import interfaces, currency, validation
-from .validation import validate
+from . import interfaces, currency, validation, batch, prefork
+from .validation import validate, is_valid
+from .batch import validate_batch, validate_stream
 from .currency import Currency
+from .prefork import freeze
 from .validation import ValidatorBase, Base58CheckValidator, EthereumValidator
@@ -0,0 +1,58 @@
+"""
+:mod:`coinaddr.__main__`
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Command line interface for the coinaddr package.
+
+Usage::
+
+    $ coinaddr serve --unix /run/coinaddr.sock
+    $ python -m coinaddr serve --host 127.0.0.1 --port 8765
+
+"""
+
+import argparse
+
+from . import server
+
+
+def main(argv=None):
+    """Run the coinaddr command line interface."""
+    parser = argparse.ArgumentParser(prog='coinaddr')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser(
+        'serve', help='run a local validation server')
+    serve.add_argument(
+        '--unix', metavar='PATH', help='listen on this Unix socket')
+    serve.add_argument(
+        '--host', default='127.0.0.1', help='TCP host to listen on')
+    serve.add_argument(
+        '--port', type=int, default=8765, help='TCP port to listen on')
+    serve.add_argument(
+        '--framing', choices=server.FRAMINGS, default=server.LINES,
+        help='message framing')
+    serve.add_argument(
+        '--window', type=float, default=0.001,
+        help='seconds to wait for more requests to batch')
+    serve.add_argument(
+        '--max-batch', type=int, default=1024,
+        help='maximum number of requests per batch')
+    serve.add_argument(
+        '--max-message', type=int, default=server.MAX_MESSAGE,
+        help='maximum size of a request in bytes')
+    serve.add_argument(
+        '--max-pending', type=int, default=1024,
+        help='maximum number of unanswered requests per connection')
+
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        server.serve(
+            host=args.host, port=args.port, path=args.unix,
+            framing=args.framing, window=args.window,
+            max_batch=args.max_batch, max_message=args.max_message,
+            max_pending=args.max_pending)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+:mod:`coinaddr.arrow`
+~~~~~~~~~~~~~~~~~~~~~
+
+Validation of Apache Arrow address columns, and a pandas accessor.
+
+Addresses are read straight out of the offsets and data buffers of the
+column and fed to the validator's batch kernel as buffer slices, without
+converting each row to a Python string or building result objects.
+
+Requires ``pyarrow``; the pandas accessor is registered when ``pandas`` is
+installed too.
+
+Usage::
+
+    >>> import pyarrow as pa
+    >>> from coinaddr.arrow import validate_column
+    >>> valid, network = validate_column(
+    ...     'btc', pa.array(['1BoatSLRHtKNngkdXEeobR76b53LETtpyT', None]))
+    >>> valid.to_pylist(), network.to_pylist()
+    ([True, None], ['main', None])
+
+    >>> import pandas as pd
+    >>> pd.Series(['1BoatSLRHtKNngkdXEeobR76b53LETtpyT']).coinaddr.validate('btc')
+       valid network
+    0   True    main
+
+"""
+
+import pyarrow as pa
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+from . import currency
+from .batch import run_kernel
+from .validation import Validators
+
+
+def _is_large(array_type):
+    if pa.types.is_large_string(array_type) or pa.types.is_large_binary(
+            array_type):
+        return True
+    elif pa.types.is_string(array_type) or pa.types.is_binary(array_type):
+        return False
+    raise TypeError(
+        'expected a string or binary array, not %s' % array_type)
+
+
+def _slices(array):
+    """Yield a memoryview of every row of `array`, or None for nulls."""
+    validity, offsets, data = array.buffers()
+    offsets = memoryview(offsets).cast('q' if _is_large(array.type) else 'i')
+    data = memoryview(data) if data is not None else memoryview(b'')
+    bitmap = memoryview(validity) if validity is not None else None
+
+    for i in range(array.offset, array.offset + len(array)):
+        if bitmap is not None and not bitmap[i >> 3] >> (i & 7) & 1:
+            yield None
+        else:
+            yield data[offsets[i]:offsets[i + 1]]
+
+
+def _validate_array(inst, validator, array):
+    rows = list(_slices(array))
+    present = [i for i, row in enumerate(rows) if row is not None]
+    results = run_kernel(validator, inst, [rows[i] for i in present])
+
+    valid = [None] * len(rows)
+    codes = [None] * len(rows)
+    networks = {}
+    for i, (ok, network) in zip(present, results):
+        valid[i] = ok
+        codes[i] = networks.setdefault(network, len(networks))
+
+    return (
+        pa.array(valid, type=pa.bool_()),
+        pa.DictionaryArray.from_arrays(
+            pa.array(codes, type=pa.int32()),
+            pa.array(list(networks), type=pa.string())),
+    )
+
+
+def validate_column(name, array):
+    """Validate every address of an Arrow column.
+
+    :param name str: The name or ticker code of the cryptocurrency.
+    :param array: A ``pyarrow`` string or binary Array or ChunkedArray.
+    :return: a boolean array of validity and a dictionary encoded array of
+        networks, both null where the address is null, and chunked like
+        the input.
+    :rtype: tuple
+    :raises: ValueError: if the currency is unknown.
+    :raises: TypeError: if the array is not a string or binary array.
+    """
+    inst = currency.Currencies.get(name, None)
+    if inst is None:
+        raise ValueError('unknown currency %r' % name)
+    validator = Validators.get(inst.validator)
+    _is_large(array.type)
+
+    if isinstance(array, pa.ChunkedArray):
+        chunks = [_validate_array(inst, validator, c) for c in array.chunks]
+        return (
+            pa.chunked_array([valid for valid, _ in chunks], pa.bool_()),
+            pa.chunked_array(
+                [network for _, network in chunks],
+                pa.dictionary(pa.int32(), pa.string())),
+        )
+    return _validate_array(inst, validator, array)
+
+
+if pd is not None:
+    @pd.api.extensions.register_series_accessor('coinaddr')
+    class AddressAccessor:
+        """Validate a series of addresses, as ``series.coinaddr``."""
+
+        def __init__(self, series):
+            self._series = series
+
+        def validate(self, name):
+            """Return a DataFrame of ``valid`` and ``network`` columns."""
+            valid, network = validate_column(name, pa.array(self._series))
+            index = self._series.index
+            return pd.DataFrame({
+                'valid': valid.to_pandas().set_axis(index),
+                'network': network.to_pandas().set_axis(index),
+            })
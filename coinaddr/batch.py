@@ -0,0 +1,219 @@
+"""
+:mod:`coinaddr.batch`
+~~~~~~~~~~~~~~~~~~~~~
+
+Batch validation of mixed currency inputs.
+
+Rows are partitioned by the validator of their currency, each partition is
+run through that validator's batch kernel (see
+:class:`coinaddr.interfaces.IBatchValidator`), and the results are
+scattered back into input order.
+
+Usage::
+
+    >>> import coinaddr
+    >>> coinaddr.validate_batch([
+    ...     ('btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT'),
+    ...     ('eth', b'0x154985aD8A10AFe32bdF9CE08b8b9dcD082Db34d'),
+    ... ])
+    [ValidationResult(name='bitcoin', ...), ValidationResult(name='ethereum', ...)]
+
+"""
+
+from itertools import islice
+
+from . import currency, shadow, validation
+from .interfaces import IBatchValidator
+from .validation import (
+    ErrorResult, ValidationRequest, Validators, _buffer, compile_plan)
+
+
+def _resolve(name, cache):
+    try:
+        return cache[name]
+    except KeyError:
+        pass
+
+    inst = currency.Currencies.get(name, None)
+    if inst is None:
+        raise ValueError('unknown currency %r' % name)
+    validator = Validators.get(inst.validator)
+    if validator is None:
+        raise ValueError('unknown validator %r' % inst.validator)
+    cache[name] = inst, validator
+    return inst, validator
+
+
+def _validate_each(validator, inst, addresses):
+    results = []
+    for address in addresses:
+        instance = validator(ValidationRequest(inst.name, address))
+        results.append((instance.validate(), instance.network))
+    return results
+
+
+def run_kernel(validator, inst, addresses):
+    """Run the batch kernel of `validator` over addresses of one currency.
+
+    Validators providing :class:`coinaddr.interfaces.IBatchValidator` get
+    the whole batch and the currency's precompiled plan, any other validator
+    is called once per address.  Every batch API goes through here, so the
+    results are checked against the reference validators while
+    :mod:`coinaddr.shadow` mode is enabled.
+
+    :return: a list of ``(valid, network)`` tuples in input order.
+    """
+    if IBatchValidator.providedBy(validator):
+        results = validator.validate_batch(addresses, compile_plan(inst))
+    else:
+        results = _validate_each(validator, inst, addresses)
+    monitor = shadow.current
+    if monitor is not None:
+        monitor.observe(inst, addresses, results)
+    return results
+
+
+def partition(pairs):
+    """Group `(currency, address)` pairs by validator and currency.
+
+    :return: a mapping of validator class -> currency -> ``(indices,
+        addresses)``, where indices are positions in the input.
+    """
+    cache = {}
+    groups = {}
+    for index, (name, address) in enumerate(pairs):
+        inst, validator = _resolve(name, cache)
+        by_currency = groups.setdefault(validator, {})
+        indices, addresses = by_currency.setdefault(inst, ([], []))
+        indices.append(index)
+        addresses.append(_buffer(address))
+    return groups
+
+
+def validate_batch(pairs):
+    """Validate `(currency, address)` pairs of possibly mixed currencies.
+
+    :param pairs: an iterable of ``(currency, address)`` pairs, where currency
+        is a name or ticker code and address is text or bytes-like.
+    :return: a list of ValidationResult objects in input order.
+    :rtype: list
+    :raises: ValueError: if a currency or its validator is unknown.
+    """
+    groups = partition(pairs)
+    size = sum(
+        len(indices)
+        for by_currency in groups.values()
+        for indices, _ in by_currency.values()
+    )
+
+    results = [None] * size
+    for validator, by_currency in groups.items():
+        for inst, (indices, addresses) in by_currency.items():
+            kernel = run_kernel(validator, inst, addresses)
+            for index, address, (valid, network) in zip(
+                    indices, addresses, kernel):
+                # Looked up on the module, where tracing swaps in its timer.
+                results[index] = validation._result(
+                    inst, address, valid, network)
+    return results
+
+
+def _error_address(address):
+    if isinstance(address, str):
+        return address.encode('utf-8', 'backslashreplace')
+    elif isinstance(address, (bytes, bytearray, memoryview)):
+        return bytes(address)
+    # Never bytes(), which allocates a zeroed buffer for an integer.
+    return repr(address).encode('ascii', 'backslashreplace')
+
+
+def _prepare(item, name, cache):
+    """Return a validatable ``(name, buffer)`` pair, or an ErrorResult."""
+    address = item
+    try:
+        if name is None:
+            if isinstance(item, (str, bytes, bytearray, memoryview)):
+                raise TypeError('expected a (currency, address) pair')
+            name, address = item
+        inst, _ = _resolve(name, cache)
+    except Exception as exc:
+        return ErrorResult(
+            name if isinstance(name, str) else '', '',
+            _error_address(address), str(exc) or type(exc).__name__)
+
+    try:
+        address = _buffer(address)
+        if not isinstance(address, (bytes, bytearray, memoryview)):
+            raise TypeError(
+                'expected text or a bytes-like address, not %s'
+                % type(address).__name__)
+        return name, address
+    except Exception as exc:
+        return ErrorResult(
+            inst.name, inst.ticker, _error_address(address),
+            str(exc) or type(exc).__name__)
+
+
+def _validate_chunk(pairs, cache):
+    """Validate a chunk of pairs, isolating exceptions raised by validators.
+
+    The chunk is validated as one batch, and only if that raises are the
+    pairs validated one at a time, each failure becoming an ErrorResult.
+    """
+    try:
+        return validate_batch(pairs)
+    except Exception:
+        pass
+
+    results = []
+    for name, address in pairs:
+        try:
+            result, = validate_batch([(name, address)])
+        except Exception as exc:
+            inst, _ = _resolve(name, cache)
+            result = ErrorResult(
+                inst.name, inst.ticker, bytes(address),
+                str(exc) or type(exc).__name__)
+        results.append(result)
+    return results
+
+
+def validate_stream(items, currency=None, chunk_size=1024):
+    """Lazily validate a possibly unbounded iterable of addresses.
+
+    Items are consumed and validated `chunk_size` at a time through
+    :func:`validate_batch`, so no more than one chunk is in flight.  Inputs
+    that cannot be validated, such as non-ascii text, unknown currencies or
+    addresses a validator raises on, yield an ErrorResult instead of
+    raising.
+
+    :param items: an iterable of addresses if `currency` is given, else of
+        ``(currency, address)`` pairs.
+    :param currency str: The name or ticker code shared by all addresses.
+    :param chunk_size int: Number of items validated together.
+    :return: an iterator of results, in input order.
+
+    Usage::
+
+      >>> import coinaddr
+      >>> for result in coinaddr.validate_stream(queue_consumer, 'btc'):
+      ...     handle(result)
+
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive')
+
+    cache = {}
+    items = iter(items)
+    while True:
+        chunk = [
+            _prepare(item, currency, cache)
+            for item in islice(items, chunk_size)
+        ]
+        if not chunk:
+            return
+
+        pairs = [row for row in chunk if isinstance(row, tuple)]
+        results = iter(_validate_chunk(pairs, cache))
+        for row in chunk:
+            yield next(results) if isinstance(row, tuple) else row
@@ -0,0 +1,206 @@
+"""
+:mod:`coinaddr.cache`
+~~~~~~~~~~~~~~~~~~~~~
+
+A persistent, size bounded validation result cache shared across processes.
+
+Results are stored in an SQLite database in WAL mode, so any number of
+worker processes can read concurrently while one writes.  Records are keyed
+by a digest of the canonical currency name and the address, and only hold
+the validity and network.  Once the cache grows past `max_entries` the
+oldest records are evicted first.
+
+The database records the :data:`VERSION` that wrote it.  A database written
+by another version of the format or of this package is cleared when opened,
+so results never outlive a change to the validators.
+
+Usage::
+
+    >>> from coinaddr.cache import SQLiteCache
+    >>> cache = SQLiteCache('/var/cache/coinaddr.sqlite')
+    >>> cache.validate('btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT')
+    ValidationResult(name='bitcoin', ticker='btc',
+    ...              address=b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT',
+    ...              valid=True, network='main')
+
+"""
+
+import os
+import sqlite3
+import threading
+from hashlib import blake2b
+
+from . import __version__, currency
+from .batch import validate_batch
+from .validation import ValidationResult, _buffer
+
+
+FORMAT_VERSION = 1
+
+#: Cached results are only used by the same format and package version.
+VERSION = '%d:%s' % (FORMAT_VERSION, __version__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    key BLOB NOT NULL UNIQUE,
+    valid INTEGER NOT NULL,
+    network TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def digest(name, address):
+    """Return the cache key for `address` of the currency `name`."""
+    key = blake2b(name.encode('ascii'), digest_size=16)
+    key.update(b'\0')
+    key.update(address)
+    return key.digest()
+
+
+class SQLiteCache:
+    """A validation result cache backed by an SQLite database at `path`.
+
+    :param path str: Database file, created if it does not exist.
+    :param max_entries int: Number of records kept before evicting.
+    :param timeout float: Seconds to wait on a database locked by a writer.
+    """
+
+    def __init__(self, path, max_entries=10000000, timeout=30.0):
+        if max_entries < 1:
+            raise ValueError('max_entries must be positive')
+        self.path = path
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pid = None
+        self._conn = None
+
+    @property
+    def connection(self):
+        """The connection of the current process, opened on first use."""
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(
+                self.path, timeout=self.timeout, check_same_thread=False,
+                isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._prepare(self._conn)
+            self._pid = os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _prepare(conn):
+        """Create the tables, clearing results written by another VERSION."""
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for statement in _SCHEMA.split(';'):
+                if statement.strip():
+                    conn.execute(statement)
+            row = conn.execute(
+                "SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != VERSION:
+                conn.execute('DELETE FROM results')
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) "
+                    "VALUES ('version', ?)", (VERSION,))
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def close(self):
+        """Close the connection of the current process."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = self._pid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self.connection.execute(
+                'SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def get_many(self, keys):
+        """Return a mapping of key -> ``(valid, network)`` for cached keys."""
+        found = {}
+        keys = list(keys)
+        with self._lock:
+            conn = self.connection
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = conn.execute(
+                    'SELECT key, valid, network FROM results WHERE key IN (%s)'
+                    % ','.join('?' * len(chunk)), chunk)
+                for key, valid, network in rows:
+                    found[key] = bool(valid), network
+        return found
+
+    def put_many(self, records):
+        """Store ``(key, valid, network)`` records, then evict if needed."""
+        with self._lock:
+            conn = self.connection
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(
+                    'INSERT OR IGNORE INTO results (key, valid, network) '
+                    'VALUES (?, ?, ?)',
+                    ((key, int(valid), network)
+                     for key, valid, network in records))
+                conn.execute(
+                    'DELETE FROM results WHERE id <= '
+                    '(SELECT MAX(id) FROM results) - ?', (self.max_entries,))
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def validate_batch(self, pairs):
+        """Like :func:`coinaddr.validate_batch`, consulting the cache first.
+
+        Only addresses missing from the cache are validated, and their
+        results are stored for later runs.
+        """
+        rows = []
+        names = {}
+        for name, address in pairs:
+            if name not in names:
+                inst = currency.Currencies.get(name, None)
+                if inst is None:
+                    raise ValueError('unknown currency %r' % name)
+                names[name] = inst
+            inst, address = names[name], bytes(_buffer(address))
+            rows.append((inst, address, digest(inst.name, address)))
+
+        cached = self.get_many({key for _, _, key in rows})
+        missing = {}
+        for inst, address, key in rows:
+            if key not in cached:
+                missing.setdefault(key, (inst.name, address))
+
+        if missing:
+            results = validate_batch(missing.values())
+            self.put_many(
+                (key, result.valid, result.network)
+                for key, result in zip(missing, results))
+            for key, result in zip(missing, results):
+                cached[key] = result.valid, result.network
+
+        return [
+            ValidationResult(inst.name, inst.ticker, address, *cached[key])
+            for inst, address, key in rows
+        ]
+
+    def validate(self, currency, address):
+        """Like :func:`coinaddr.validate`, consulting the cache first."""
+        return self.validate_batch([(currency, address)])[0]
@@ -0,0 +1,332 @@
+"""
+:mod:`coinaddr.corpus`
+~~~~~~~~~~~~~~~~~~~~~~
+
+Deterministic synthetic address corpora for load and benchmark testing.
+
+Every sample is built with the same encoders the validators check against
+(Base58Check, Bech32 and EIP-55), and is labelled with the validity it was
+constructed to have.  Besides valid addresses, the following controlled
+invalid classes can be produced:
+
+* ``checksum``: a corrupted checksum.
+* ``version``: a version byte that belongs to none of the currency networks.
+* ``case``: a casing the encoding does not allow.
+* ``truncated``: the last character removed.
+* ``leading_zeros``: a non-canonical leading zero prepended.
+
+Not every class applies to every validator; inapplicable classes are simply
+never produced for that currency.
+
+Samples are generated lazily, so arbitrarily large corpora can be streamed
+without being held in memory.
+
+Usage::
+
+    >>> from coinaddr import corpus
+    >>> samples = corpus.generate('btc', 1000, seed=42)
+    >>> next(samples)
+    Sample(currency='bitcoin', address=b'1...', valid=True, network='main',
+    ...    kind='valid')
+
+"""
+
+import random
+from hashlib import sha256
+from itertools import islice
+
+import attr
+import base58check
+from Crypto.Hash import keccak
+
+from . import currency
+from .segwit_addr import CHARSET, bech32_decode, encode
+
+
+VALID = 'valid'
+CHECKSUM = 'checksum'
+VERSION = 'version'
+CASE = 'case'
+TRUNCATED = 'truncated'
+LEADING_ZEROS = 'leading_zeros'
+
+KINDS = (VALID, CHECKSUM, VERSION, CASE, TRUNCATED, LEADING_ZEROS)
+
+
+@attr.s(frozen=True, slots=True)
+class Sample:
+    """A generated address together with its expected validation outcome."""
+
+    currency = attr.ib(type=str)
+    address = attr.ib(type=bytes)
+    valid = attr.ib(type=bool)
+    network = attr.ib(type=str)
+    kind = attr.ib(type=str)
+
+
+def _checksum(payload):
+    return sha256(sha256(payload).digest()).digest()[:4]
+
+
+def _b58check_ok(address, charset):
+    abytes = base58check.b58decode(address, charset=charset)
+    return (len(abytes) > 4 and _checksum(abytes[:-4]) == abytes[-4:] and
+            base58check.b58encode(abytes, charset=charset) == address)
+
+
+def _swap_case(address, rng, allowed):
+    """Swap the case of one character whose swapped form is in `allowed`."""
+    positions = [
+        i for i, char in enumerate(address)
+        if chr(char).isalpha() and
+        ord(chr(char).swapcase()) in allowed
+    ]
+    if not positions:
+        return None
+    pos = rng.choice(positions)
+    swapped = chr(address[pos]).swapcase().encode('ascii')
+    return address[:pos] + swapped + address[pos + 1:]
+
+
+class Base58CheckGenerator:
+    """Generates Base58Check samples."""
+
+    kinds = (VALID, CHECKSUM, VERSION, CASE, TRUNCATED, LEADING_ZEROS)
+
+    def __init__(self, cur, rng):
+        self.currency = cur
+        self.rng = rng
+        self.charset = cur.charset or base58check.DEFAULT_CHARSET
+        self.versions = [
+            (name, version)
+            for name, versions in sorted(cur.networks.items())
+            for version in versions
+        ]
+        known = {version for _, version in self.versions}
+        self.foreign = [byte for byte in range(256) if byte not in known]
+
+    def _encode(self, payload, checksum=None):
+        if checksum is None:
+            checksum = _checksum(payload)
+        return base58check.b58encode(payload + checksum, charset=self.charset)
+
+    def _payload(self, version):
+        return bytes([version]) + self.rng.getrandbits(160).to_bytes(20, 'big')
+
+    def valid(self):
+        network, version = self.rng.choice(self.versions)
+        return self._encode(self._payload(version)), network
+
+    def invalid(self, kind):
+        if kind == VERSION:
+            return self._encode(self._payload(self.rng.choice(self.foreign)))
+
+        if kind == CHECKSUM:
+            payload = self._payload(self.rng.choice(self.versions)[1])
+            checksum = bytearray(_checksum(payload))
+            checksum[self.rng.randrange(4)] ^= 1 << self.rng.randrange(8)
+            return self._encode(payload, bytes(checksum))
+
+        address, _ = self.valid()
+        if kind == CASE:
+            address = _swap_case(address, self.rng, self.charset)
+        elif kind == TRUNCATED:
+            address = address[:-1]
+        elif kind == LEADING_ZEROS:
+            address = self.charset[:1] + address
+
+        if address is None or _b58check_ok(address, self.charset):
+            return None
+        return address
+
+
+class SegWitGenerator:
+    """Generates Bech32 encoded SegWit samples."""
+
+    kinds = (VALID, CHECKSUM, CASE, TRUNCATED)
+
+    def __init__(self, cur, rng):
+        self.currency = cur
+        self.rng = rng
+        self.hrps = [
+            (name, hrp)
+            for name, hrps in sorted(cur.networks.items())
+            for hrp in hrps
+        ]
+
+    def valid(self):
+        network, hrp = self.rng.choice(self.hrps)
+        size = self.rng.choice((20, 32))
+        witprog = list(self.rng.getrandbits(8 * size).to_bytes(size, 'big'))
+        return encode(hrp, 0, witprog).encode('ascii'), network
+
+    def invalid(self, kind):
+        address, _ = self.valid()
+        text = address.decode('ascii')
+        if kind == CHECKSUM:
+            pos = self.rng.randrange(text.rfind('1') + 1, len(text))
+            char = self.rng.choice(CHARSET.replace(text[pos], ''))
+            text = text[:pos] + char + text[pos + 1:]
+        elif kind == CASE:
+            swapped = _swap_case(address, self.rng, range(256))
+            if swapped is None:
+                return None
+            text = swapped.decode('ascii')
+        elif kind == TRUNCATED:
+            text = text[:-1]
+
+        if bech32_decode(text) != (None, None):
+            return None
+        return text.encode('ascii')
+
+
+class EthereumGenerator:
+    """Generates hex encoded, optionally EIP-55 checksummed, samples."""
+
+    kinds = (VALID, CHECKSUM, CASE, TRUNCATED, LEADING_ZEROS)
+
+    def __init__(self, cur, rng):
+        self.currency = cur
+        self.rng = rng
+
+    @staticmethod
+    def _checksummed(addr):
+        digest = keccak.new(digest_bits=256, data=addr.encode('ascii'))
+        digest = digest.hexdigest()
+        return ''.join(
+            char.upper() if int(digest[i], 16) > 7 else char
+            for i, char in enumerate(addr)
+        )
+
+    @classmethod
+    def _checksum_ok(cls, addr):
+        if addr.lower() == addr or addr.upper() == addr:
+            return True
+        return cls._checksummed(addr.lower()) == addr
+
+    def _hex(self):
+        return '%040x' % self.rng.getrandbits(160)
+
+    def valid(self):
+        addr = self._hex()
+        style = self.rng.randrange(3)
+        if style == 0:
+            addr = self._checksummed(addr)
+        elif style == 1:
+            addr = addr.upper()
+        prefix = '0x' if self.rng.getrandbits(1) else ''
+        return (prefix + addr).encode('ascii'), 'both'
+
+    def invalid(self, kind):
+        addr = self._checksummed(self._hex())
+        if kind == CHECKSUM:
+            positions = [i for i, char in enumerate(addr) if char.isalpha()]
+            if not positions:
+                return None
+            pos = self.rng.choice(positions)
+            addr = addr[:pos] + addr[pos].swapcase() + addr[pos + 1:]
+        elif kind == CASE:
+            addr = ''.join(
+                char.swapcase() if self.rng.getrandbits(1) else char
+                for char in addr
+            )
+        elif kind == TRUNCATED:
+            return ('0x' + addr[:-1]).encode('ascii')
+        elif kind == LEADING_ZEROS:
+            return ('0x0' + addr).encode('ascii')
+
+        if self._checksum_ok(addr):
+            return None
+        return ('0x' + addr).encode('ascii')
+
+
+GENERATORS = {
+    'Base58Check': Base58CheckGenerator,
+    'SegWitCheck': SegWitGenerator,
+    'Ethereum': EthereumGenerator,
+}
+
+
+def _samples(cur, seed, kinds):
+    generator_cls = GENERATORS.get(cur.validator)
+    if generator_cls is None:
+        raise ValueError(
+            'no corpus generator for validator %r' % cur.validator)
+
+    rng = random.Random('%s:%s' % (seed, cur.name))
+    generator = generator_cls(cur, rng)
+    kinds = [kind for kind in kinds if kind in generator.kinds]
+    if not kinds:
+        return
+
+    while True:
+        for kind in kinds:
+            if kind == VALID:
+                address, network = generator.valid()
+                yield Sample(cur.name, address, True, network, kind)
+                continue
+
+            address = None
+            while address is None:
+                address = generator.invalid(kind)
+            yield Sample(cur.name, address, False, '', kind)
+
+
+def generate(name, count=None, seed=0, kinds=KINDS):
+    """Lazily generate samples for a single currency.
+
+    Samples cycle through the requested `kinds` that apply to the currency's
+    validator; valid samples are spread over all of the currency networks.
+
+    :param name str: The name or ticker code of the cryptocurrency.
+    :param count int: Number of samples, or None for an endless stream.
+    :param seed: Seed making the corpus reproducible.
+    :param kinds: The sample kinds to produce.
+    :return: an iterator of :class:`Sample` objects.
+    :raises: ValueError: if the currency has no corpus generator.
+    """
+    cur = currency.Currencies.get(name, None)
+    if cur is None:
+        raise ValueError('unknown currency %r' % name)
+    return islice(_samples(cur, seed, kinds), count)
+
+
+def generate_all(count=None, seed=0, kinds=KINDS, currencies=None):
+    """Lazily generate samples interleaved across currencies.
+
+    :param count int: Number of samples per currency, or None for endless.
+    :param seed: Seed making the corpus reproducible.
+    :param kinds: The sample kinds to produce.
+    :param currencies: Names or tickers to include, defaults to every
+        registered currency with a corpus generator.
+    :return: an iterator of :class:`Sample` objects.
+    """
+    if currencies is None:
+        currencies = [
+            name for name, inst in sorted(currency.Currencies.instances.items())
+            if inst.validator in GENERATORS
+        ]
+    streams = [generate(name, count, seed, kinds) for name in currencies]
+    while streams:
+        for stream in list(streams):
+            sample = next(stream, None)
+            if sample is None:
+                streams.remove(stream)
+            else:
+                yield sample
+
+
+def dump(samples, fp):
+    """Write samples to the binary file `fp`, one tab separated row each.
+
+    Rows hold the currency, address, validity (``1``/``0``), network and
+    kind, so millions of samples can be written without buffering them.
+    """
+    for sample in samples:
+        fp.write(b'\t'.join((
+            sample.currency.encode('ascii'),
+            sample.address,
+            b'1' if sample.valid else b'0',
+            sample.network.encode('ascii'),
+            sample.kind.encode('ascii'),
+        )) + b'\n')
@@ -79,6 +79,23 @@ class IValidator(Interface):
         """Validate the address type, True if valid, else False."""
 
 
+class IBatchValidator(Interface):
+    """A validator class with a batch kernel, validating many addresses.
+
+    Provided by the validator class itself, e.g. with
+    ``@zope.interface.provider(IBatchValidator)`` and a classmethod.  Batch
+    APIs use it when present and fall back to one request per address.
+    """
+
+    def validate_batch(addresses, plan):
+        """Validate addresses of the currency described by plan.
+
+        addresses is a sequence of bytes-like objects, plan the currency's
+        precompiled CurrencyPlan.  Returns a list of (valid, network)
+        tuples in input order, equal to what validate() and network give.
+        """
+
+
 class IValidationRequest(Interface):
     """Contains the data and helpers for a given validation request."""
 
@@ -87,10 +104,14 @@ class IValidationRequest(Interface):
     extras = Attribute('Any extra attributes to be passed to decoder, etc')
     networks = Attribute(
         'Concatenated list of all network versions for currency')
+    plan = Attribute('The precompiled lookup tables for the currency')
 
-    def execute():
+    def execute(lazy=False):
         """Executes the request and returns a ValidationResult object"""
 
+    def is_valid():
+        """Executes only the validation, returning a bool"""
+
 
 class IValidationResult(Interface):
     """Represents all data for a validation result."""
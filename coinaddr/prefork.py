@@ -0,0 +1,83 @@
+"""
+:mod:`coinaddr.prefork`
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Helpers for sharing coinaddr's tables across forked worker processes.
+
+Call :func:`freeze` in the parent process (e.g. a gunicorn ``preload_app``
+or a Celery worker parent) once every currency has been registered, right
+before forking, and :func:`thaw` in every worker after the fork (e.g. from
+gunicorn's ``post_fork`` hook), so each worker starts from pages that are
+already populated and keeps sharing them.
+
+For the most sharing, also call :func:`gc.disable` early in the parent, so
+no collection frees slots in pages the workers would later fill and copy.
+
+Usage::
+
+    >>> import coinaddr
+    >>> coinaddr.freeze()
+    12
+    >>> # in each worker, after the fork
+    >>> coinaddr.prefork.thaw()
+
+"""
+
+import gc
+
+import base58check
+
+from . import currency
+from .validation import Validators, _b58digits, compile_plan
+
+
+def freeze(disable=True):
+    """Build every lookup table up front and freeze the garbage collector.
+
+    A :class:`coinaddr.validation.CurrencyPlan` of immutable, bytes backed
+    tables is compiled for every registered currency with a known validator,
+    which :func:`coinaddr.validate`, :func:`coinaddr.is_valid` and the batch
+    APIs all read.  Then every live object is moved to the permanent
+    generation with :func:`gc.freeze`, so collections in forked workers do
+    not write to, and thereby copy, the pages holding them.
+
+    No collection is run first: it would free slots in the parent's pages,
+    which the workers would then fill, copying the pages anyway.
+
+    Currencies registered afterwards still work; their tables are built on
+    first use in each worker.
+
+    :param disable bool: Also disable the garbage collector until
+        :func:`thaw` is called in the worker, so no collection runs between
+        freezing and forking.
+    :return: the number of currency plans compiled.
+    """
+    if disable:
+        gc.disable()
+    _b58digits(base58check.DEFAULT_CHARSET)
+    plans = [
+        compile_plan(inst)
+        for inst in currency.Currencies.instances.values()
+        if Validators.get(inst.validator) is not None
+    ]
+    gc.freeze()
+    return len(plans)
+
+
+def thaw():
+    """Re-enable the garbage collector in a worker, after the fork.
+
+    Frozen objects stay in the permanent generation, so the pages holding
+    them remain shared with the parent.
+    """
+    gc.enable()
+
+
+def unfreeze():
+    """Undo :func:`freeze` in the process that called it.
+
+    Frozen objects move back into the oldest garbage collector generation,
+    and the garbage collector is enabled again.
+    """
+    gc.unfreeze()
+    gc.enable()
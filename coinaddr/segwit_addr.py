@@ -22,6 +22,10 @@
 
 
 CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+CHARSET_REV = bytes(
+    CHARSET.index(c) if c in CHARSET else 0xff
+    for c in (chr(x).lower() for x in range(256))
+)
 
 
 def bech32_polymod(values):
@@ -77,6 +81,37 @@ def bech32_decode(bech):
     return (hrp, data[:-6])
 
 
+def bech32_decode_buffer(bech):
+    """Validate a Bech32 bytes-like object, and determine HRP and data.
+
+    Equivalent to :func:`bech32_decode`, but reads `bech` in place instead of
+    requiring it to be converted to text first.
+    """
+    size = len(bech)
+    if size > 90:
+        return (None, None)
+    pos = -1
+    lower = upper = False
+    for i, char in enumerate(bech):
+        if char < 33 or char > 126:
+            return (None, None)
+        if 97 <= char <= 122:
+            lower = True
+        elif 65 <= char <= 90:
+            upper = True
+        elif char == 49:
+            pos = i
+    if (lower and upper) or pos < 1 or pos + 7 > size:
+        return (None, None)
+    data = [CHARSET_REV[x] for x in bech[pos+1:]]
+    if 0xff in data:
+        return (None, None)
+    hrp = bytes(bech[:pos]).decode('ascii').lower()
+    if not bech32_verify_checksum(hrp, data):
+        return (None, None)
+    return (hrp, data[:-6])
+
+
 def convertbits(data, frombits, tobits, pad=True):
     """General power-of-2 base conversion."""
     acc = 0
@@ -0,0 +1,258 @@
+"""
+:mod:`coinaddr.server`
+~~~~~~~~~~~~~~~~~~~~~~
+
+A local validation server with micro-batching.
+
+The server listens on a Unix socket or a TCP address and keeps connections
+open for any number of requests.  A request is a currency and an address
+separated by a tab (or a single space).  Each reply is either the validity
+(``1`` or ``0``) and network separated by a tab, or ``E`` and an error
+message.  Requests may be pipelined; replies are sent in request order.
+
+Two framings are supported:
+
+* ``lines``: every message ends with a newline.
+* ``length``: every message is preceded by its size as a 4 byte big endian
+  unsigned integer.
+
+Messages longer than `max_message` bytes get an ``E`` reply, after which
+the connection is closed.  Validation runs on the event loop, so the default
+of :data:`MAX_MESSAGE` bytes, well above the longest address, keeps a single
+request from stalling every connection.
+
+Requests arriving within `window` seconds of each other, from any
+connection, are validated together through :func:`coinaddr.validate_batch`.
+
+Usage::
+
+    $ coinaddr serve --unix /run/coinaddr.sock
+    $ printf 'btc\\t1BoatSLRHtKNngkdXEeobR76b53LETtpyT\\n' | nc -U /run/coinaddr.sock
+    1\tmain
+
+"""
+
+import asyncio
+import struct
+
+from . import currency
+from .batch import _validate_chunk
+from .validation import ErrorResult
+
+
+LINES = 'lines'
+LENGTH = 'length'
+FRAMINGS = (LINES, LENGTH)
+
+MAX_MESSAGE = 256
+
+_SIZE = struct.Struct('>I')
+
+
+class MicroBatcher:
+    """Collects submitted addresses and validates them in batches.
+
+    A batch is validated `window` seconds after its first address was
+    submitted, or as soon as it holds `max_batch` addresses.  An address the
+    validator raises on only fails its own future.
+    """
+
+    def __init__(self, window=0.001, max_batch=1024):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = []
+        self._timer = None
+
+    def submit(self, name, address):
+        """Queue an address, return a future of its ValidationResult."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((name, address, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        """Validate everything queued so far."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        try:
+            results = _validate_chunk(
+                [(name, address) for name, address, _ in pending], {})
+        except Exception as exc:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, _, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _parse(message):
+    name, sep, address = message.partition(b'\t')
+    if not sep:
+        name, sep, address = message.partition(b' ')
+    if not sep or not address:
+        raise ValueError('expected a currency and an address')
+    name = name.decode('ascii')
+    if currency.Currencies.get(name, None) is None:
+        raise ValueError('unknown currency %r' % name)
+    return name, address
+
+
+def _reply(result):
+    if isinstance(result, ErrorResult):
+        return _error(result.error)
+    return b'%d\t%s' % (result.valid, result.network.encode('ascii'))
+
+
+def _error(exc):
+    return b'E\t' + str(exc).replace('\n', ' ').encode('ascii', 'replace')
+
+
+class Server:
+    """Serves validation requests, see the module documentation.
+
+    :param framing str: Either ``'lines'`` or ``'length'``.
+    :param window float: Seconds to wait for more requests to batch.
+    :param max_batch int: Maximum number of requests per batch.
+    :param max_message int: Maximum size of a request in bytes.
+    :param max_pending int: Maximum number of unanswered requests per
+        connection before reading from it pauses.
+    """
+
+    def __init__(self, framing=LINES, window=0.001, max_batch=1024,
+                 max_message=MAX_MESSAGE, max_pending=1024):
+        if framing not in FRAMINGS:
+            raise ValueError('framing must be one of %r' % (FRAMINGS,))
+        self.framing = framing
+        self.max_message = max_message
+        self.max_pending = max_pending
+        self.batcher = MicroBatcher(window, max_batch)
+
+    async def _read(self, reader):
+        """Return the next message, None at the end of the stream.
+
+        :raises: ValueError: if the message exceeds `max_message`.
+        """
+        if self.framing == LINES:
+            line = await reader.readline()
+            if not line.endswith(b'\n'):
+                return None
+            return line.rstrip(b'\r\n')
+
+        try:
+            size, = _SIZE.unpack(await reader.readexactly(_SIZE.size))
+            if size > self.max_message:
+                raise ValueError(
+                    'message of %d bytes exceeds the %d byte limit'
+                    % (size, self.max_message))
+            return await reader.readexactly(size)
+        except asyncio.IncompleteReadError:
+            return None
+
+    def _write(self, writer, message):
+        if self.framing == LINES:
+            writer.write(message + b'\n')
+        else:
+            writer.write(_SIZE.pack(len(message)) + message)
+
+    async def _respond(self, writer, replies):
+        closed = False
+        while True:
+            reply = await replies.get()
+            if reply is None:
+                break
+            if closed:
+                # Keep consuming, so the reader never blocks on a full queue.
+                continue
+            try:
+                message = _reply(await reply)
+            except Exception as exc:
+                message = _error(exc)
+            try:
+                self._write(writer, message)
+                if replies.empty():
+                    await writer.drain()
+            except ConnectionError:
+                closed = True
+                writer.close()
+        if not closed:
+            await writer.drain()
+
+    async def handle(self, reader, writer):
+        """Serve a single connection until the client closes it."""
+        loop = asyncio.get_running_loop()
+        replies = asyncio.Queue(maxsize=self.max_pending)
+        responder = asyncio.ensure_future(self._respond(writer, replies))
+        cancelled = False
+        try:
+            while True:
+                try:
+                    message = await self._read(reader)
+                except ValueError as exc:
+                    # Oversized message, the stream cannot be resynchronized.
+                    reply = loop.create_future()
+                    reply.set_exception(exc)
+                    await replies.put(reply)
+                    break
+                if message is None:
+                    break
+                try:
+                    reply = self.batcher.submit(*_parse(message))
+                except Exception as exc:
+                    reply = loop.create_future()
+                    reply.set_exception(exc)
+                await replies.put(reply)
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            cancelled = True
+        finally:
+            try:
+                if cancelled:
+                    responder.cancel()
+                else:
+                    await replies.put(None)
+                    await responder
+            except (ConnectionError, asyncio.CancelledError):
+                responder.cancel()
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        """Start listening on the Unix socket `path`, else on host and port.
+
+        :return: the listening :class:`asyncio.Server`.
+        """
+        # Leaves room for a line's \r\n terminator.
+        limit = self.max_message + 2
+        if path is not None:
+            return await asyncio.start_unix_server(
+                self.handle, path=path, limit=limit)
+        return await asyncio.start_server(
+            self.handle, host=host, port=port, limit=limit)
+
+
+def serve(host='127.0.0.1', port=8765, path=None, **kwargs):
+    """Run a :class:`Server` until interrupted.
+
+    Keyword arguments are passed to :class:`Server`.
+    """
+    async def run():
+        server = await Server(**kwargs).start(host, port, path)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,227 @@
+"""
+:mod:`coinaddr.shadow`
+~~~~~~~~~~~~~~~~~~~~~~
+
+Shadow mode, differentially checking the batch kernels against the
+reference validators.
+
+While enabled, a sampled fraction of the addresses validated by
+:func:`coinaddr.validate`, :func:`coinaddr.is_valid` and the batch kernels
+(see :func:`coinaddr.batch.run_kernel`) is validated again through the
+reference path: the original, unoptimized implementations of the
+built-in validators (``base58check`` and :mod:`hashlib` for Base58Check,
+a text based EIP-55 check for Ethereum, and
+:func:`coinaddr.segwit_addr.bech32_decode` for SegWit), which share no code
+with the optimized paths.  Other validators are checked against their
+per-request ``validate()`` and ``network``.  Disagreements are counted and
+the first ones recorded.  Samples are drawn by skipping geometrically
+distributed gaps, so the extra cost is proportional to the sample rate.
+
+Usage::
+
+    >>> from coinaddr import shadow
+    >>> monitor = shadow.enable(rate=0.001)
+    >>> ...
+    >>> monitor.checked, monitor.mismatches, monitor.records
+    (1204, 0, [])
+
+"""
+
+import math
+import random
+import re
+import threading
+from hashlib import sha256
+
+import attr
+import base58check
+from Crypto.Hash import keccak
+
+from . import validation
+from .segwit_addr import bech32_decode
+
+
+current = None
+
+
+@attr.s(frozen=True, slots=True)
+class Mismatch:
+    """An address the optimized and the reference paths disagree on.
+
+    Results are ``(valid, network)`` tuples, with a None network where only
+    the validity was derived; `expected` is None when the reference path
+    raised.
+    """
+
+    currency = attr.ib(type=str)
+    address = attr.ib(type=bytes)
+    result = attr.ib(type=tuple)
+    expected = attr.ib()
+
+
+def _base58_reference(inst, address):
+    address = bytes(address)
+    extras = {'charset': inst.charset} if inst.charset else {}
+
+    valid = False
+    if 25 <= len(address) <= 35:
+        try:
+            abytes = base58check.b58decode(address, **extras)
+            checksum = sha256(sha256(abytes[:-4]).digest()).digest()[:4]
+            valid = (
+                any(abytes[0] in versions
+                    for versions in inst.networks.values())
+                and abytes[-4:] == checksum
+                and address == base58check.b58encode(abytes, **extras)
+            )
+        except Exception:
+            valid = False
+
+    network = ''
+    try:
+        abytes = base58check.b58decode(address, **extras)
+        network = next(
+            (name for name, versions in inst.networks.items()
+             if abytes[0] in versions),
+            '',
+        )
+    except Exception:
+        pass
+    return valid, network
+
+
+def _ethereum_reference(inst, address):
+    address = bytes(address).decode('latin-1')
+    if not re.match(r'^(0x)?[0-9a-f]{40}$', address, flags=re.IGNORECASE):
+        return False, 'both'
+    elif (re.match(r'^(0x)?[0-9a-f]{40}$', address) or
+          re.match(r'^(0x)?[0-9A-F]{40}$', address)):
+        return True, 'both'
+
+    addr = address[2:] if address.startswith('0x') else address
+    addr_hash = keccak.new(digest_bits=256)
+    addr_hash.update(addr.lower().encode('utf-8'))
+    addr_hash = addr_hash.hexdigest()
+
+    valid = not any(
+        (int(addr_hash[i], 16) > 7 and addr[i].upper() != addr[i]) or
+        (int(addr_hash[i], 16) <= 7 and addr[i].lower() != addr[i])
+        for i in range(len(addr))
+    )
+    return valid, 'both'
+
+
+def _segwit_reference(inst, address):
+    hrp, data = bech32_decode(bytes(address).decode('latin-1'))
+    network = next(
+        (name for name, hrps in inst.networks.items() if hrp in hrps),
+        'unknown',
+    )
+    return bool(hrp) and bool(data), network
+
+
+def reference(inst, address):
+    """Validate `address` through the reference path.
+
+    :return: a ``(valid, network)`` tuple.
+    """
+    check = _REFERENCES.get(inst.validator)
+    if check is not None:
+        return check(inst, address)
+    validator = validation.Validators.get(inst.validator)(
+        validation.ValidationRequest(inst.name, address))
+    return validator.validate(), validator.network
+
+
+# Keyed by validator name, validation imports this module while loading.
+_REFERENCES = {
+    'Base58Check': _base58_reference,
+    'Ethereum': _ethereum_reference,
+    'SegWitCheck': _segwit_reference,
+}
+
+
+class Shadow:
+    """Compares a sampled fraction of batch kernel results to the reference.
+
+    :param rate float: Fraction of addresses to check, in (0, 1].
+    :param max_records int: Number of disagreeing inputs to record.
+    :param on_mismatch: Optional callable, called with every Mismatch.
+    """
+
+    def __init__(self, rate=0.01, max_records=100, on_mismatch=None,
+                 seed=None):
+        if not 0.0 < rate <= 1.0:
+            raise ValueError('rate must be in (0, 1], not %r' % rate)
+        self.rate = rate
+        self.max_records = max_records
+        self.on_mismatch = on_mismatch
+        self.checked = 0
+        self.mismatches = 0
+        self.records = []
+        self._random = random.Random(seed).random
+        self._lock = threading.Lock()
+        self._skip = self._gap() - 1
+
+    def _gap(self):
+        if self.rate >= 1.0:
+            return 1
+        return int(math.log(1.0 - self._random()) /
+                   math.log(1.0 - self.rate)) + 1
+
+    def _check(self, inst, address, result):
+        try:
+            expected = reference(inst, address)
+        except Exception:
+            expected = None
+        if expected is not None and result[1] is None:
+            expected = expected[0], None
+        if expected is not None and tuple(result) == tuple(expected):
+            return None
+        return Mismatch(inst.name, bytes(address), tuple(result), expected)
+
+    def observe(self, inst, addresses, results):
+        """Check the sampled subset of a batch kernel's input and output.
+
+        Results are ``(valid, network)`` tuples, the network is only
+        compared if it is not None.
+        """
+        with self._lock:
+            index = self._skip
+            sampled = []
+            while index < len(addresses):
+                sampled.append(index)
+                index += self._gap()
+            self._skip = index - len(addresses)
+        if not sampled:
+            return
+
+        found = [
+            mismatch for mismatch in (
+                self._check(inst, addresses[i], results[i]) for i in sampled)
+            if mismatch is not None
+        ]
+
+        with self._lock:
+            self.checked += len(sampled)
+            self.mismatches += len(found)
+            room = self.max_records - len(self.records)
+            self.records.extend(found[:max(room, 0)])
+
+        if self.on_mismatch is not None:
+            for mismatch in found:
+                self.on_mismatch(mismatch)
+
+
+def enable(rate=0.01, max_records=100, on_mismatch=None, seed=None):
+    """Enable shadow mode, replacing any active Shadow, and return it."""
+    global current
+    current = Shadow(rate, max_records, on_mismatch, seed)
+    return current
+
+
+def disable():
+    """Disable shadow mode, returning the Shadow that was active."""
+    global current
+    shadow, current = current, None
+    return shadow
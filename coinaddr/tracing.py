@@ -0,0 +1,226 @@
+"""
+:mod:`coinaddr.tracing`
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Lightweight per-stage tracing hooks for the validators.
+
+Validators break their work into named stages (see :data:`STAGES`).  Each
+stage is a plain module level function that is swapped for a timed wrapper
+only while at least one hook is registered, so tracing costs nothing while
+it is disabled.
+
+Hooks are called as ``hook(stage, elapsed_ns)`` after every stage.  Stages
+do not nest: a stage called while another one is timed, such as the Base58
+decode done to derive the network, is not reported on its own and its time
+is included in the outer stage.
+
+Hooks may ask for only a fraction of the stages (see :func:`add_hook`).  The
+sampling decision is made once per outermost stage call, before timing it,
+and stage calls that are not sampled run untimed.
+
+Usage::
+
+    >>> import coinaddr
+    >>> from coinaddr import tracing
+    >>> with tracing.SamplingTracer(rate=1.0) as tracer:
+    ...     coinaddr.validate('btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT')
+    >>> tracer.stats()['base58_decode']
+    StageStats(count=1, total_ns=...)
+
+"""
+
+import functools
+import random
+import sys
+import threading
+from time import perf_counter_ns
+
+import attr
+
+
+BASE58_DECODE = 'base58_decode'
+DOUBLE_SHA256 = 'double_sha256'
+REENCODE = 'reencode'
+BECH32_POLYMOD = 'bech32_polymod'
+KECCAK = 'keccak'
+NETWORK = 'network'
+RESULT = 'result'
+
+STAGES = (
+    BASE58_DECODE,
+    DOUBLE_SHA256,
+    REENCODE,
+    BECH32_POLYMOD,
+    KECCAK,
+    NETWORK,
+    RESULT,
+)
+
+_hooks = []
+_instrumented = []
+_local = threading.local()
+_sampler = random.Random()
+_rate = 1.0
+
+
+def _emit(name, elapsed):
+    for hook, rate in _hooks:
+        if rate >= _rate or _sampler.random() * _rate < rate:
+            hook(name, elapsed)
+
+
+def _timed(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if getattr(_local, 'timing', False):
+            return func(*args, **kwargs)
+        _local.timing = True
+        if _rate < 1.0 and _sampler.random() >= _rate:
+            # Not sampled, neither is any stage nested in this one.
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _local.timing = False
+
+        start = perf_counter_ns()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as exc:
+            elapsed = perf_counter_ns() - start
+            _local.timing = False
+            try:
+                _emit(name, elapsed)
+            finally:
+                # A failing hook must not hide the stage's own exception.
+                raise exc
+        elapsed = perf_counter_ns() - start
+        _local.timing = False
+        _emit(name, elapsed)
+        return result
+    return wrapper
+
+
+def _register(namespace, attribute, func, name):
+    wrapper = _timed(name, func)
+    _instrumented.append((namespace, attribute, func, wrapper))
+    return wrapper if _hooks else func
+
+
+def instrument(namespace, attribute, name):
+    """Register `namespace.attribute` as the implementation of stage `name`.
+
+    `namespace` is a module or class whose attribute is looked up at call
+    time, so swapping it in place is enough to trace every caller.
+    """
+    func = getattr(namespace, attribute)
+    setattr(namespace, attribute, _register(namespace, attribute, func, name))
+
+
+def stage(name):
+    """Decorator registering a module level function as stage `name`."""
+    def decorator(func):
+        module = sys.modules[func.__module__]
+        return _register(module, func.__name__, func, name)
+    return decorator
+
+
+def _install(traced):
+    for namespace, attribute, func, wrapper in _instrumented:
+        setattr(namespace, attribute, wrapper if traced else func)
+
+
+def _update():
+    global _rate
+    _rate = max((rate for _, rate in _hooks), default=1.0)
+    _install(bool(_hooks))
+
+
+def add_hook(hook, rate=1.0):
+    """Register `hook(stage, elapsed_ns)` to be called after each stage.
+
+    :param rate float: Fraction of stage calls to time and report to
+        `hook`, in (0, 1].
+    """
+    if not 0.0 < rate <= 1.0:
+        raise ValueError('rate must be in (0, 1], not %r' % rate)
+    _hooks.append((hook, rate))
+    _update()
+
+
+def remove_hook(hook):
+    """Unregister a previously added hook."""
+    for index, (registered, _) in enumerate(_hooks):
+        if registered is hook:
+            del _hooks[index]
+            break
+    else:
+        raise ValueError('hook %r is not registered' % (hook,))
+    _update()
+
+
+@attr.s(frozen=True, slots=True)
+class StageStats:
+    """Aggregated timings for a single stage."""
+
+    count = attr.ib(type=int)
+    total_ns = attr.ib(type=int)
+
+    @property
+    def mean_ns(self):
+        """Mean time spent per call, in nanoseconds."""
+        return self.total_ns / self.count if self.count else 0.0
+
+
+class SamplingTracer:
+    """A hook aggregating the time spent per stage for a sample of calls.
+
+    Only a `rate` fraction of stage calls are timed at all, the others run
+    untimed, so a low rate keeps the overhead low.  `seed` seeds the sampling
+    of stage calls when the tracer is enabled.  Use it as a context manager,
+    or call :meth:`enable` and :meth:`disable`.
+    """
+
+    def __init__(self, rate=0.01, seed=None):
+        if not 0.0 < rate <= 1.0:
+            raise ValueError('rate must be in (0, 1], not %r' % rate)
+        self.rate = rate
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(STAGES, 0)
+        self._totals = dict.fromkeys(STAGES, 0)
+
+    def __call__(self, name, elapsed):
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + 1
+            self._totals[name] = self._totals.get(name, 0) + elapsed
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def enable(self):
+        """Start receiving stage events."""
+        if self.seed is not None:
+            _sampler.seed(self.seed)
+        add_hook(self, self.rate)
+
+    def disable(self):
+        """Stop receiving stage events."""
+        remove_hook(self)
+
+    def reset(self):
+        """Discard everything aggregated so far."""
+        with self._lock:
+            self._counts = dict.fromkeys(STAGES, 0)
+            self._totals = dict.fromkeys(STAGES, 0)
+
+    def stats(self):
+        """Return a mapping of stage name -> :class:`StageStats`."""
+        with self._lock:
+            return {
+                name: StageStats(count, self._totals[name])
+                for name, count in self._counts.items()
+            }
@@ -11,6 +11,7 @@ import re
 from hashlib import sha256
 import functools
 import operator
+from types import MappingProxyType
 
 from zope.interface import implementer, provider
 import attr
@@ -21,13 +22,68 @@ from Crypto.Hash import keccak
 from .interfaces import (
     INamedSubclassContainer,
     IValidator,
+    IBatchValidator,
     IValidationRequest,
     IValidationResult,
     ICurrency,
 )
 from .base import NamedSubclassContainerBase
-from . import currency
-from .segwit_addr import bech32_decode
+from . import currency, segwit_addr, shadow, tracing
+from .segwit_addr import bech32_decode_buffer
+
+
+tracing.instrument(segwit_addr, "bech32_polymod", tracing.BECH32_POLYMOD)
+
+_LOWERCASE = range(ord("a"), ord("z") + 1)
+_UPPERCASE = range(ord("A"), ord("Z") + 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _b58digits(charset):
+    """Return a 256 byte table mapping `charset` characters to digits."""
+    table = bytearray(b"\xff" * 256)
+    for digit, char in enumerate(charset):
+        table[char] = digit
+    return bytes(table)
+
+
+@tracing.stage(tracing.BASE58_DECODE)
+def _b58decode(address, extras):
+    """Base58 decode any bytes-like `address` without copying it."""
+    digits = _b58digits(extras.get("charset", base58check.DEFAULT_CHARSET))
+
+    acc = pad = 0
+    for char in address:
+        digit = digits[char]
+        if digit == 0xFF:
+            raise ValueError("invalid base58 character %r" % chr(char))
+        if not acc and not digit:
+            pad += 1
+        acc = acc * 58 + digit
+
+    return b"\0" * pad + acc.to_bytes((acc.bit_length() + 7) // 8, "big")
+
+
+@tracing.stage(tracing.DOUBLE_SHA256)
+def _double_sha256(data):
+    return sha256(sha256(data).digest()).digest()
+
+
+@tracing.stage(tracing.REENCODE)
+def _b58encode(abytes, extras):
+    return base58check.b58encode(abytes, **extras)
+
+
+@tracing.stage(tracing.KECCAK)
+def _keccak_hexdigest(data):
+    addr_hash = keccak.new(digest_bits=256)
+    addr_hash.update(data)
+    return addr_hash.hexdigest()
+
+
+@tracing.stage(tracing.NETWORK)
+def _network(validator):
+    return validator.network
 
 
 @provider(INamedSubclassContainer)
@@ -67,6 +123,56 @@ class ValidatorBase(metaclass=ValidatorMeta):
         """Return the network derived from the network version bytes."""
 
 
+@attr.s(frozen=True, slots=True, eq=False)
+class CurrencyPlan:
+    """Lookup tables precompiled for validating addresses of one currency.
+
+    Tables are immutable, so once built (see :func:`coinaddr.freeze`) they can
+    be shared copy-on-write by forked worker processes.
+    """
+
+    currency = attr.ib(type=currency.Currency)
+    validator = attr.ib(type=type)
+    networks = attr.ib(type=tuple)
+    versions = attr.ib(type=bytes, repr=False)
+    hrps = attr.ib(type=MappingProxyType)
+    extras = attr.ib(type=MappingProxyType)
+
+    def version_network(self, version):
+        """Return the first network listing the version byte, else ``""``."""
+        index = self.versions[version]
+        return self.networks[index] if index != 0xFF else ""
+
+
+@functools.lru_cache(maxsize=None)
+def compile_plan(currency):
+    """Return the (cached) CurrencyPlan for a Currency instance."""
+    versions = bytearray(b"\xff" * 256)
+    hrps = {}
+    for index, (name, entries) in enumerate(currency.networks.items()):
+        for entry in entries:
+            if isinstance(entry, int):
+                if versions[entry] == 0xFF:
+                    versions[entry] = index
+            else:
+                hrps.setdefault(entry, name)
+
+    extras = {}
+    if currency.charset:
+        extras["charset"] = currency.charset
+    _b58digits(extras.get("charset", base58check.DEFAULT_CHARSET))
+
+    return CurrencyPlan(
+        currency=currency,
+        validator=Validators.get(currency.validator),
+        networks=tuple(currency.networks),
+        versions=bytes(versions),
+        hrps=MappingProxyType(hrps),
+        extras=MappingProxyType(extras),
+    )
+
+
+@provider(IBatchValidator)
 @attr.s(frozen=True, slots=True, eq=False)
 @implementer(IValidator)
 class Base58CheckValidator(ValidatorBase):
@@ -79,69 +185,90 @@ class Base58CheckValidator(ValidatorBase):
         if len(self.request.address) < 25 or len(self.request.address) > 35:
             return False
 
+        plan = self.request.plan
         try:
-            abytes = base58check.b58decode(self.request.address, **self.request.extras)
-            if abytes[0] not in self.request.networks:
+            abytes = _b58decode(self.request.address, plan.extras)
+            if not plan.version_network(abytes[0]):
                 return False
 
-            checksum = sha256(sha256(abytes[:-4]).digest()).digest()[:4]
+            checksum = _double_sha256(abytes[:-4])[:4]
             if abytes[-4:] != checksum:
                 return False
 
-            return self.request.address == base58check.b58encode(
-                abytes, **self.request.extras
-            )
+            return self.request.address == _b58encode(abytes, plan.extras)
         except Exception:
             return False
 
     @property
     def network(self):
         """Return network derived from network version bytes."""
+        plan = self.request.plan
         try:
-            abytes = base58check.b58decode(self.request.address, **self.request.extras)
-
-            nbyte = abytes[0]
-            for name, networks in self.request.currency.networks.items():
-                if nbyte in networks:
-                    return name
+            abytes = _b58decode(self.request.address, plan.extras)
+            return plan.version_network(abytes[0])
         except Exception:
             pass
 
         return ""
 
-
+    @classmethod
+    def validate_batch(cls, addresses, plan):
+        """Validate many addresses, decoding each address only once."""
+        extras = plan.extras
+
+        results = []
+        for address in addresses:
+            valid, network = False, ""
+            try:
+                abytes = _b58decode(address, extras)
+                network = plan.version_network(abytes[0])
+                valid = (
+                    bool(network)
+                    and 25 <= len(address) <= 35
+                    and _double_sha256(abytes[:-4])[:4] == abytes[-4:]
+                    and address == _b58encode(abytes, extras)
+                )
+            except Exception:
+                pass
+            results.append((valid, network))
+        return results
+
+
+@provider(IBatchValidator)
 @attr.s(frozen=True, slots=True, eq=False)
 @implementer(IValidator)
 class EthereumValidator(ValidatorBase):
     """Validates ethereum based crytocurrency addresses."""
 
     name = "Ethereum"
-    non_checksummed_pattern = re.compile(r"^(0x)?[0-9a-f]{40}$", flags=re.IGNORECASE)
+    non_checksummed_pattern = re.compile(rb"^(0x)?[0-9a-f]{40}$", flags=re.IGNORECASE)
+    lowercase_pattern = re.compile(rb"^(0x)?[0-9a-f]{40}$")
+    uppercase_pattern = re.compile(rb"^(0x)?[0-9A-F]{40}$")
 
     def validate(self):
         """Validate the address."""
-        address = self.request.address.decode()
+        return self._validate(self.request.address)
+
+    @classmethod
+    def validate_batch(cls, addresses, plan):
+        """Validate many addresses without a request per address."""
+        return [(cls._validate(address), "both") for address in addresses]
 
-        if not self.non_checksummed_pattern.match(address):
+    @classmethod
+    def _validate(cls, address):
+        if not cls.non_checksummed_pattern.match(address):
             return False
-        elif re.match(r"^(0x)?[0-9a-f]{40}$", address) or re.match(
-            r"^(0x)?[0-9A-F]{40}$", address
+        elif cls.lowercase_pattern.match(address) or cls.uppercase_pattern.match(
+            address
         ):
             return True
 
-        addr = address[2:] if address.startswith("0x") else address
-        addr_hash = keccak.new(digest_bits=256)
-        addr_hash.update(addr.lower().encode("utf-8"))
-        addr_hash = addr_hash.hexdigest()
+        addr = address[2:] if address[:2] == b"0x" else address
+        addr_hash = _keccak_hexdigest(bytes(addr).lower())
 
         return not any(
-            any(
-                [
-                    int(addr_hash[i], 16) > 7 and addr[i].upper() != addr[i],
-                    int(addr_hash[i], 16) <= 7 and addr[i].lower() != addr[i],
-                ]
-            )
-            for i in range(len(addr))
+            char in (_LOWERCASE if int(digit, 16) > 7 else _UPPERCASE)
+            for char, digit in zip(addr, addr_hash)
         )
 
     @property
@@ -150,6 +277,7 @@ class EthereumValidator(ValidatorBase):
         return "both"
 
 
+@provider(IBatchValidator)
 @attr.s(frozen=True, slots=True, eq=False)
 @implementer(IValidator)
 class SegWitValidator(ValidatorBase):
@@ -159,26 +287,47 @@ class SegWitValidator(ValidatorBase):
 
     def validate(self):
         """Validate the address."""
-        hrp, data = bech32_decode(self.request.address.decode())
+        hrp, data = bech32_decode_buffer(self.request.address)
         return bool(hrp) and bool(data)
 
     @property
     def network(self):
         """Return network derived from network version bytes."""
-        hrp, data = bech32_decode(self.request.address.decode())
-        return next(
-            (
-                name
-                for name, networks in self.request.currency.networks.items()
-                if hrp in networks
-            ),
-            "unknown",
-        )
+        hrp, data = bech32_decode_buffer(self.request.address)
+        return self.request.plan.hrps.get(hrp, "unknown")
+
+    @classmethod
+    def validate_batch(cls, addresses, plan):
+        """Validate many addresses, decoding each address only once."""
+        hrps = plan.hrps
+
+        results = []
+        for address in addresses:
+            hrp, data = bech32_decode_buffer(address)
+            results.append((bool(hrp) and bool(data), hrps.get(hrp, "unknown")))
+        return results
 
 
 # @attr.s(frozen=True, slots=True, eq=False)
 
 
+def _buffer(address):
+    """Return `address` as a flat bytes-like object, encoding text as ascii.
+
+    Bytes-like objects, including slices of larger buffers, are used in place
+    and only copied once a result needs to keep the address.  Strided views
+    are copied up front, as neither casting nor :mod:`re` supports them.
+    """
+    if isinstance(address, str):
+        return address.encode("ascii")
+    elif isinstance(address, memoryview):
+        if not address.c_contiguous:
+            return address.tobytes()
+        elif address.format != "B" or address.ndim != 1:
+            return address.cast("B")
+    return address
+
+
 @attr.s(frozen=True, slots=True, eq=False)
 @implementer(IValidationRequest)
 class ValidationRequest:
@@ -194,17 +343,19 @@ class ValidationRequest:
     )
     address = attr.ib(
         type=bytes,
-        converter=lambda a: a if isinstance(a, bytes) else a.encode("ascii"),
-        validator=attr.validators.instance_of(bytes),
+        converter=_buffer,
+        validator=attr.validators.instance_of((bytes, bytearray, memoryview)),
     )
 
+    @property
+    def plan(self):
+        """The precompiled CurrencyPlan of the currency."""
+        return compile_plan(self.currency)
+
     @property
     def extras(self):
         """Extra arguments for passing to decoder, etc."""
-        extras = {}
-        if self.currency.charset:
-            extras.setdefault("charset", self.currency.charset)
-        return extras
+        return self.plan.extras
 
     @property
     def networks(self):
@@ -212,16 +363,49 @@ class ValidationRequest:
         networks = tuple(self.currency.networks.values())
         return functools.reduce(operator.concat, networks)
 
-    def execute(self):
-        """Execute this request and return the result."""
+    def execute(self, lazy=False):
+        """Execute this request and return the result.
+
+        When `lazy` is true a LazyValidationResult is returned instead, which
+        only derives the network when it is accessed.
+        """
         validator = Validators.get(self.currency.validator)(self)
-        return ValidationResult(
-            name=self.currency.name,
-            ticker=self.currency.ticker,
-            address=self.address,
-            valid=validator.validate(),
-            network=validator.network,
+        monitor = shadow.current
+        if lazy:
+            address = bytes(self.address)
+            valid = bool(validator.validate())
+            if monitor is not None:
+                monitor.observe(self.currency, [address], [(valid, None)])
+            if not valid:
+                validator = None
+            elif address is not self.address:
+                # Defer over the copy, the caller may reuse its buffer.
+                validator = type(validator)(
+                    ValidationRequest(self.currency.name, address)
+                )
+            return LazyValidationResult(
+                name=self.currency.name,
+                ticker=self.currency.ticker,
+                address=address,
+                valid=valid,
+                validator=validator,
+            )
+        result = _result(
+            self.currency, self.address, validator.validate(), _network(validator)
         )
+        if monitor is not None:
+            monitor.observe(
+                self.currency, [self.address], [(result.valid, result.network)]
+            )
+        return result
+
+    def is_valid(self):
+        """Execute only the validation of this request, return a bool."""
+        valid = bool(Validators.get(self.currency.validator)(self).validate())
+        monitor = shadow.current
+        if monitor is not None:
+            monitor.observe(self.currency, [self.address], [(valid, None)])
+        return valid
 
 
 @attr.s(frozen=True, slots=True, eq=False)
@@ -239,13 +423,78 @@ class ValidationResult:
         return self.valid
 
 
-def validate(currency, address):
+@attr.s(frozen=True, slots=True, eq=False)
+@implementer(IValidationResult)
+class ErrorResult:
+    """The result for an input that could not be validated at all.
+
+    If the currency is unknown, name holds the name as given (e.g.
+    ``'nocoin'``) and ticker is empty.  The address holds a best effort
+    bytes representation of the input.
+    """
+
+    name = attr.ib(type=str, validator=attr.validators.instance_of(str))
+    ticker = attr.ib(type=str, validator=attr.validators.instance_of(str))
+    address = attr.ib(type=bytes, validator=attr.validators.instance_of(bytes))
+    error = attr.ib(type=str, validator=attr.validators.instance_of(str))
+    valid = attr.ib(type=bool, default=False, init=False)
+    network = attr.ib(type=str, default="", init=False)
+
+    def __bool__(self):
+        return False
+
+
+@attr.s(frozen=True, slots=True, eq=False)
+@implementer(IValidationResult)
+class LazyValidationResult:
+    """A validation result whose network is derived only when accessed.
+
+    The network of an invalid address is never derived and is always ``""``.
+    Only the validator of a valid address is kept, over a copy of the
+    address, until the network has been derived.
+    """
+
+    name = attr.ib(type=str, validator=attr.validators.instance_of(str))
+    ticker = attr.ib(type=str, validator=attr.validators.instance_of(str))
+    address = attr.ib(type=bytes, validator=attr.validators.instance_of(bytes))
+    valid = attr.ib(type=bool, validator=attr.validators.instance_of(bool))
+    _validator = attr.ib(default=None, repr=False)
+    _network = attr.ib(init=False, default=None, repr=False)
+
+    @property
+    def network(self):
+        """Name of network the address belongs to if applicable."""
+        if self._network is None:
+            validator = self._validator
+            network = _network(validator) if validator is not None else ""
+            object.__setattr__(self, "_network", network)
+            object.__setattr__(self, "_validator", None)
+        return self._network
+
+    def __bool__(self):
+        return self.valid
+
+
+@tracing.stage(tracing.RESULT)
+def _result(currency, address, valid, network):
+    return ValidationResult(
+        name=currency.name,
+        ticker=currency.ticker,
+        address=bytes(address),
+        valid=valid,
+        network=network,
+    )
+
+
+def validate(currency, address, lazy=False):
     """Validate the given address according to currency type.
 
     This is the main entrypoint for using this library.
 
     :param currency str: The name or ticker code of the cryptocurrency.
     :param address (bytes, str): The crytocurrency address to validate.
+    :param lazy bool: Return a LazyValidationResult, deriving the network
+        only when accessed and never for invalid addresses.
     :return: a populated ValidationResult object
     :rtype: :inst:`ValidationResult`
 
@@ -259,4 +508,24 @@ def validate(currency, address):
 
     """
     request = ValidationRequest(currency, address)
-    return request.execute()
+    return request.execute(lazy=lazy)
+
+
+def is_valid(currency, address):
+    """Return True if the address is valid for the currency, else False.
+
+    Unlike :func:`validate`, neither the network nor a result object is
+    derived, making this the cheapest check when only the boolean matters.
+
+    :param currency str: The name or ticker code of the cryptocurrency.
+    :param address (bytes, str): The crytocurrency address to validate.
+    :rtype: bool
+
+    Usage::
+
+      >>> import coinaddr
+      >>> coinaddr.is_valid('btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT')
+      True
+
+    """
+    return ValidationRequest(currency, address).is_valid()
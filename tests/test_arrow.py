@@ -0,0 +1,68 @@
+import pytest
+
+import coinaddr
+from coinaddr import corpus
+
+pa = pytest.importorskip('pyarrow')
+arrow = pytest.importorskip('coinaddr.arrow')
+
+
+def _expected(name, addresses):
+    results = [
+        None if address is None else coinaddr.validate(name, address)
+        for address in addresses
+    ]
+    return (
+        [None if r is None else r.valid for r in results],
+        [None if r is None else r.network for r in results],
+    )
+
+
+class TestArrow:
+    @pytest.mark.parametrize('name', ['btc', 'xrp', 'btc-segwit', 'eth'])
+    @pytest.mark.parametrize(
+        'array_type', [pa.string(), pa.large_string(), pa.binary()])
+    def test_validate_column(self, name, array_type):
+        addresses = [s.address for s in corpus.generate(name, 40, seed=4)]
+        addresses[3] = None
+        array = pa.array(addresses, type=pa.binary()).cast(array_type)
+
+        valid, network = arrow.validate_column(name, array)
+
+        assert valid.type == pa.bool_()
+        assert pa.types.is_dictionary(network.type)
+        assert (valid.to_pylist(), network.to_pylist()) == _expected(
+            name, addresses)
+
+    def test_sliced_and_chunked(self):
+        addresses = [s.address for s in corpus.generate('btc', 30, seed=9)]
+        array = pa.chunked_array([
+            pa.array(addresses[:10], type=pa.binary()).slice(2),
+            pa.array(addresses[10:], type=pa.binary()),
+        ])
+
+        valid, network = arrow.validate_column('btc', array)
+
+        expected = addresses[2:10] + addresses[10:]
+        assert valid.num_chunks == 2
+        assert (valid.to_pylist(), network.to_pylist()) == _expected(
+            'btc', expected)
+
+    def test_rejects_non_string_arrays(self):
+        with pytest.raises(TypeError):
+            arrow.validate_column('btc', pa.array([1, 2]))
+        with pytest.raises(ValueError):
+            arrow.validate_column('nocoin', pa.array(['a']))
+
+    def test_pandas_accessor(self):
+        pd = pytest.importorskip('pandas')
+        series = pd.Series(
+            ['1BoatSLRHtKNngkdXEeobR76b53LETtpyT',
+             '1BoatSLRHtKNngkdXEeobR76b53LETtpyU'],
+            index=['a', 'b'])
+
+        frame = series.coinaddr.validate('btc')
+
+        assert list(frame.index) == ['a', 'b']
+        assert list(frame['valid']) == [True, False]
+        assert list(frame['network']) == ['main', 'main']
@@ -0,0 +1,189 @@
+import attr
+import pytest
+from zope.interface import implementer, provider
+
+import coinaddr
+from coinaddr import batch, corpus
+from coinaddr.currency import Currencies, Currency
+from coinaddr.interfaces import IBatchValidator, IValidator
+from coinaddr.validation import (
+    Base58CheckValidator, EthereumValidator, SegWitValidator, ErrorResult,
+    ValidatorBase)
+
+
+class TestBatch:
+    def test_matches_validate(self):
+        pairs = [
+            (sample.currency, sample.address)
+            for sample in corpus.generate_all(30, seed=5)
+        ]
+        pairs.append(('btc', b''))
+        pairs.append(('btc-segwit', b'not bech32'))
+        pairs.append(('eth', '0x154985aD8A10AFe32bdF9CE08b8b9dcD082Db34d'))
+
+        results = coinaddr.validate_batch(pairs)
+
+        assert len(results) == len(pairs)
+        for (name, address), result in zip(pairs, results):
+            expected = coinaddr.validate(name, address)
+            assert attr.astuple(result) == attr.astuple(expected)
+
+    def test_partition(self):
+        groups = batch.partition([
+            ('btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT'),
+            ('eth', b'0x154985aD8A10AFe32bdF9CE08b8b9dcD082Db34d'),
+            ('bitcoin', b'3QJmV3qfvL9SuYo34YihAf3sRCW3qSinyC'),
+            ('btc-segwit', b'bc1q9yl05qdyz7gvtnmrrrjc0x48q3dpq44vx5p9kz'),
+        ])
+
+        assert set(groups) == {
+            Base58CheckValidator, EthereumValidator, SegWitValidator}
+        (indices, _), = groups[Base58CheckValidator].values()
+        assert indices == [0, 2]
+
+    def test_unknown_currency(self):
+        with pytest.raises(ValueError):
+            coinaddr.validate_batch([('nocoin', b'')])
+
+    def test_empty(self):
+        assert coinaddr.validate_batch([]) == []
+
+
+class TestValidateStream:
+    def test_matches_validate(self):
+        pairs = [
+            (sample.currency, sample.address)
+            for sample in corpus.generate_all(10, seed=8)
+        ]
+
+        results = list(coinaddr.validate_stream(pairs, chunk_size=7))
+
+        assert len(results) == len(pairs)
+        for (name, address), result in zip(pairs, results):
+            expected = coinaddr.validate(name, address)
+            assert attr.astuple(result) == attr.astuple(expected)
+
+    def test_single_currency(self):
+        addresses = [b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT', 'not valid']
+        results = list(coinaddr.validate_stream(addresses, 'btc'))
+
+        assert [result.valid for result in results] == [True, False]
+
+    def test_errors_are_isolated(self):
+        items = [
+            ('btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT'),
+            ('btc', '1BoatSLRHtKNngkdXEeobR76b53LETtpyé'),
+            ('nocoin', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT'),
+            ('btc', 12345),
+            'not a pair',
+            ('eth', b'0x154985aD8A10AFe32bdF9CE08b8b9dcD082Db34d'),
+        ]
+
+        results = list(coinaddr.validate_stream(items, chunk_size=2))
+
+        assert [result.valid for result in results] == [
+            True, False, False, False, False, True]
+        assert not isinstance(results[0], ErrorResult)
+        for result in results[1:5]:
+            assert isinstance(result, ErrorResult)
+            assert result.error
+        assert results[1].name == 'bitcoin'
+        assert results[2].name == 'nocoin'
+        assert results[2].ticker == ''
+        assert results[3].address == b'12345'
+        assert results[4].address == b'not a pair'
+
+    def test_error_address_is_bounded(self):
+        results = list(coinaddr.validate_stream(
+            [('btc', 3 * 10 ** 8), b'ab']))
+
+        assert [result.address for result in results] == [
+            b'300000000', b'ab']
+        assert results[1].error == 'expected a (currency, address) pair'
+
+    def test_validator_errors_are_isolated(self):
+        @implementer(IValidator)
+        class RaisingValidator(ValidatorBase):
+            name = 'Raising'
+
+            def validate(self):
+                if self.request.address == b'boom':
+                    raise RuntimeError('validator failed')
+                return True
+
+            @property
+            def network(self):
+                return 'main'
+
+        Currency('raisingcoin', ticker='rsc', validator='Raising')
+        items = [b'good', b'boom', b'fine', b'also good']
+
+        results = list(coinaddr.validate_stream(items, 'rsc', chunk_size=3))
+
+        assert [result.valid for result in results] == [
+            True, False, True, True]
+        assert isinstance(results[1], ErrorResult)
+        assert results[1].name == 'raisingcoin'
+        assert results[1].ticker == 'rsc'
+        assert results[1].address == b'boom'
+        assert results[1].error == 'validator failed'
+        assert not isinstance(results[3], ErrorResult)
+
+    def test_is_lazy(self):
+        def endless():
+            while True:
+                yield 'btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT'
+
+        stream = coinaddr.validate_stream(endless(), chunk_size=4)
+        assert all(next(stream).valid for _ in range(10))
+
+
+class TestBatchValidatorProtocol:
+    def test_kernel_receives_batch_and_plan(self):
+        calls = []
+
+        @provider(IBatchValidator)
+        @implementer(IValidator)
+        class KernelValidator(ValidatorBase):
+            name = 'Kernel'
+
+            def validate(self):
+                return True
+
+            @property
+            def network(self):
+                return 'main'
+
+            @classmethod
+            def validate_batch(cls, addresses, plan):
+                calls.append((list(addresses), plan))
+                return [(True, plan.networks[0]) for _ in addresses]
+
+        Currency('kernelcoin', ticker='knc', validator='Kernel',
+                 networks=dict(main=(0x00,)))
+        results = coinaddr.validate_batch(
+            [('knc', b'a'), ('btc', b''), ('knc', b'b')])
+
+        assert [r.valid for r in results] == [True, False, True]
+        (addresses, plan), = calls
+        assert [bytes(a) for a in addresses] == [b'a', b'b']
+        assert plan.currency is Currencies.get('knc')
+        assert plan.validator is KernelValidator
+
+    def test_falls_back_to_validate(self):
+        @implementer(IValidator)
+        class PlainValidator(ValidatorBase):
+            name = 'Plain'
+
+            def validate(self):
+                return self.request.address == b'good'
+
+            @property
+            def network(self):
+                return 'main'
+
+        Currency('plaincoin', ticker='plc', validator='Plain')
+        results = coinaddr.validate_batch([('plc', b'good'), ('plc', 'bad')])
+
+        assert [r.valid for r in results] == [True, False]
+        assert [r.network for r in results] == ['main', 'main']
@@ -0,0 +1,81 @@
+import multiprocessing
+import sqlite3
+
+import attr
+
+import coinaddr
+from coinaddr import corpus
+from coinaddr import cache as cache_module
+from coinaddr.cache import SQLiteCache, digest
+
+
+def _count_valid(path):
+    with SQLiteCache(path) as cache:
+        return sum(result.valid for result in cache.validate_batch(
+            (sample.currency, sample.address)
+            for sample in corpus.generate('btc', 20, seed=1)))
+
+
+class TestSQLiteCache:
+    def test_results_match_validate(self, tmp_path):
+        pairs = [
+            (sample.currency, sample.address)
+            for sample in corpus.generate_all(5, seed=2)
+        ]
+        with SQLiteCache(str(tmp_path / 'cache.sqlite')) as cache:
+            first = cache.validate_batch(pairs)
+            second = cache.validate_batch(pairs)
+
+        for (name, address), one, two in zip(pairs, first, second):
+            expected = attr.astuple(coinaddr.validate(name, address))
+            assert attr.astuple(one) == expected
+            assert attr.astuple(two) == expected
+
+    def test_hits_skip_validation(self, tmp_path):
+        path = str(tmp_path / 'cache.sqlite')
+        address = b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT'
+        with SQLiteCache(path) as cache:
+            cache.put_many([(digest('bitcoin', address), False, 'forged')])
+            result = cache.validate('btc', address)
+
+        assert result.valid is False
+        assert result.network == 'forged'
+
+    def test_cleared_on_version_mismatch(self, tmp_path, monkeypatch):
+        path = str(tmp_path / 'cache.sqlite')
+        address = b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT'
+        with SQLiteCache(path) as cache:
+            cache.put_many([(digest('bitcoin', address), False, 'forged')])
+
+        with SQLiteCache(path) as cache:
+            assert len(cache) == 1
+
+        monkeypatch.setattr(cache_module, 'VERSION', 'other')
+        with SQLiteCache(path) as cache:
+            assert len(cache) == 0
+            assert cache.validate('btc', address).network == 'main'
+
+        conn = sqlite3.connect(path)
+        try:
+            version, = conn.execute(
+                "SELECT value FROM meta WHERE name = 'version'").fetchone()
+        finally:
+            conn.close()
+        assert version == 'other'
+
+    def test_eviction(self, tmp_path):
+        with SQLiteCache(str(tmp_path / 'cache.sqlite'),
+                         max_entries=10) as cache:
+            cache.validate_batch(
+                (sample.currency, sample.address)
+                for sample in corpus.generate('eth', 25))
+            assert len(cache) == 10
+
+    def test_shared_across_processes(self, tmp_path):
+        path = str(tmp_path / 'cache.sqlite')
+        with multiprocessing.get_context('spawn').Pool(2) as pool:
+            counts = pool.map(_count_valid, [path] * 4)
+
+        assert len(set(counts)) == 1
+        with SQLiteCache(path) as cache:
+            assert len(cache) == 20
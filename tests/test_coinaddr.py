@@ -82,6 +82,65 @@ class TestCoinaddr:
         assert result.valid == True
         assert result.network == network
 
+    @pytest.mark.parametrize("name, ticker, address, network", TEST_DATA)
+    def test_validation_from_buffer(self, name, ticker, address, network):
+        frame = memoryview(b"\x00" * 8 + address + b"\x00" * 8)
+        for buffer in (bytearray(address), frame[8:-8]):
+            result = coinaddr.validate(name, buffer)
+
+            assert type(result.address) is bytes
+            assert result.address == address
+            assert result.valid == True
+            assert result.network == network
+
+    @pytest.mark.parametrize("name, ticker, address, network", TEST_DATA)
+    def test_validation_from_strided_buffer(self, name, ticker, address, network):
+        interleaved = bytearray(len(address) * 2)
+        interleaved[::2] = address
+        buffer = memoryview(interleaved)[::2]
+
+        result = coinaddr.validate(name, buffer)
+        assert result.address == address
+        assert result.valid == True
+        assert result.network == network
+        assert coinaddr.is_valid(name, buffer) is True
+        assert coinaddr.validate_batch([(name, buffer)])[0].valid == True
+
+    @pytest.mark.parametrize("name, ticker, address, network", TEST_DATA)
+    def test_is_valid(self, name, ticker, address, network):
+        assert coinaddr.is_valid(name, address) is True
+        assert coinaddr.is_valid(name, address[:-1]) is False
+
+    @pytest.mark.parametrize("name, ticker, address, network", TEST_DATA)
+    def test_lazy_validation(self, name, ticker, address, network):
+        result = coinaddr.validate(name, address, lazy=True)
+
+        assert result.name == name
+        assert result.ticker == ticker
+        assert result.address == address
+        assert result.valid == True
+        assert result.network == network
+
+    def test_lazy_validation_skips_invalid_network(self):
+        result = coinaddr.validate("btc", b"1BoatSLRHtKNngkdXEeobR76b53LETtpyU", lazy=True)
+
+        assert result.valid == False
+        assert result.network == ""
+
+    def test_lazy_validation_copies_buffer(self):
+        buffer = bytearray(b"1BoatSLRHtKNngkdXEeobR76b53LETtpyT")
+        result = coinaddr.validate("btc", buffer, lazy=True)
+        buffer[:] = b"n2nzi7xDTrMVK9stGpbK3BtrpBCJfH7LRQ"
+
+        assert result.address == b"1BoatSLRHtKNngkdXEeobR76b53LETtpyT"
+        assert result.network == "main"
+
+    def test_lazy_validation_drops_invalid_validator(self):
+        frame = memoryview(b"1BoatSLRHtKNngkdXEeobR76b53LETtpyU")
+        result = coinaddr.validate("btc", frame, lazy=True)
+
+        assert result._validator is None
+
 
 class TestExtendingCoinaddr:
     def test_extending_currency(self):
@@ -0,0 +1,52 @@
+import io
+
+import pytest
+
+import coinaddr
+from coinaddr import corpus
+
+
+class TestCorpus:
+    def test_generate_is_lazy(self):
+        samples = corpus.generate('btc', seed=1)
+        assert iter(samples) is samples
+        assert len(list(corpus.generate('btc', 10, seed=1))) == 10
+
+    def test_generate_is_deterministic(self):
+        first = list(corpus.generate('eth', 50, seed=7))
+        second = list(corpus.generate('eth', 50, seed=7))
+        other = list(corpus.generate('eth', 50, seed=8))
+
+        assert first == second
+        assert first != other
+
+    @pytest.mark.parametrize('name', ['btc', 'xrp', 'btc-segwit', 'eth'])
+    def test_labels_match_validation(self, name):
+        for sample in corpus.generate(name, 120, seed=3):
+            result = coinaddr.validate(name, sample.address)
+            assert result.valid == sample.valid, sample
+            if sample.valid:
+                assert result.network == sample.network, sample
+
+    def test_inapplicable_kinds_are_skipped(self):
+        kinds = {
+            sample.kind for sample in corpus.generate('btc-segwit', 50)}
+        assert kinds == {'valid', 'checksum', 'case', 'truncated'}
+        assert not list(corpus.generate('btc-segwit', 5, kinds=['version']))
+
+    def test_generate_all_covers_currencies(self):
+        names = {sample.currency for sample in corpus.generate_all(2)}
+        assert {'bitcoin', 'ripple', 'ethereum', 'bitcoin-segwit'} <= names
+
+    def test_unknown_currency(self):
+        with pytest.raises(ValueError):
+            corpus.generate('nocoin', 1)
+
+    def test_dump(self):
+        fp = io.BytesIO()
+        corpus.dump(corpus.generate('btc', 3, kinds=['valid']), fp)
+        rows = fp.getvalue().splitlines()
+
+        assert len(rows) == 3
+        assert rows[0].split(b'\t')[0] == b'bitcoin'
+        assert rows[0].split(b'\t')[2] == b'1'
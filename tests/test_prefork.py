@@ -0,0 +1,67 @@
+import gc
+
+import coinaddr
+from coinaddr.currency import Currencies
+from coinaddr.validation import (
+    Base58CheckValidator, ValidationRequest, Validators, compile_plan)
+
+
+class TestFreeze:
+    def teardown_method(self):
+        coinaddr.prefork.unfreeze()
+
+    def test_freeze(self):
+        count = coinaddr.freeze()
+
+        assert count == sum(
+            Validators.get(inst.validator) is not None
+            for inst in Currencies.instances.values())
+        assert gc.get_freeze_count() > 0
+        assert coinaddr.validate(
+            'btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT').valid
+
+    def test_freeze_disables_without_collecting(self, monkeypatch):
+        def collect(*args):
+            raise AssertionError('collected before freezing')
+
+        monkeypatch.setattr(gc, 'collect', collect)
+        coinaddr.freeze()
+        assert not gc.isenabled()
+
+        coinaddr.prefork.thaw()
+        assert gc.isenabled()
+        assert gc.get_freeze_count() > 0
+
+    def test_freeze_keeps_collector_enabled(self):
+        coinaddr.freeze(disable=False)
+        assert gc.isenabled()
+        assert gc.get_freeze_count() > 0
+
+    def test_plan_tables(self):
+        plan = compile_plan(Currencies.get('ltc'))
+
+        assert plan is compile_plan(Currencies.get('litecoin'))
+        assert plan.validator is Base58CheckValidator
+        assert isinstance(plan.versions, bytes)
+        assert plan.version_network(0x30) == 'main'
+        assert plan.version_network(0x05) == 'main'
+        assert plan.version_network(0x6F) == 'test'
+        assert plan.version_network(0x00) == ''
+
+    def test_plan_hrps(self):
+        plan = compile_plan(Currencies.get('btc-segwit'))
+
+        assert dict(plan.hrps) == {'bc': 'main', 'tb': 'test'}
+
+    def test_requests_use_plan(self):
+        plan = compile_plan(Currencies.get('btc'))
+        request = ValidationRequest(
+            'btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT')
+
+        assert request.plan is plan
+        assert request.extras is plan.extras
+
+        hits = compile_plan.cache_info().hits
+        result = request.execute()
+        assert result.valid and result.network == 'main'
+        assert compile_plan.cache_info().hits > hits
@@ -0,0 +1,204 @@
+import asyncio
+import struct
+
+from zope.interface import implementer
+
+from coinaddr.currency import Currency
+from coinaddr.interfaces import IValidator
+from coinaddr.server import Server
+from coinaddr.validation import ValidatorBase
+
+
+REQUESTS = [
+    b'btc\t1BoatSLRHtKNngkdXEeobR76b53LETtpyT',
+    b'eth 0x154985aD8A10AFe32bdF9CE08b8b9dcD082Db34d',
+    b'btc-segwit\tbc1q9yl05qdyz7gvtnmrrrjc0x48q3dpq44vx5p9kz',
+    b'btc\t1BoatSLRHtKNngkdXEeobR76b53LETtpyU',
+    b'nocoin\t1BoatSLRHtKNngkdXEeobR76b53LETtpyT',
+    b'garbage',
+]
+REPLIES = [b'1\tmain', b'1\tboth', b'1\tmain', b'0\tmain']
+
+
+def _check(replies):
+    assert replies[:4] == REPLIES
+    assert replies[4].startswith(b'E\t')
+    assert replies[5].startswith(b'E\t')
+
+
+async def _roundtrip(framing, connect):
+    server = Server(framing=framing, window=0.01)
+    listener, reader, writer = await connect(server)
+    async with listener:
+        if framing == 'lines':
+            writer.write(b''.join(r + b'\n' for r in REQUESTS))
+        else:
+            writer.write(b''.join(
+                struct.pack('>I', len(r)) + r for r in REQUESTS))
+        await writer.drain()
+
+        replies = []
+        for _ in REQUESTS:
+            if framing == 'lines':
+                replies.append((await reader.readline()).rstrip(b'\n'))
+            else:
+                size, = struct.unpack('>I', await reader.readexactly(4))
+                replies.append(await reader.readexactly(size))
+        writer.close()
+    return replies
+
+
+async def _tcp(server):
+    listener = await server.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    return listener, reader, writer
+
+
+class TestServer:
+    def test_lines_over_tcp(self):
+        _check(asyncio.run(_roundtrip('lines', _tcp)))
+
+    def test_length_over_unix(self, tmp_path):
+        path = str(tmp_path / 'coinaddr.sock')
+
+        async def unix(server):
+            listener = await server.start(path=path)
+            reader, writer = await asyncio.open_unix_connection(path)
+            return listener, reader, writer
+
+        _check(asyncio.run(_roundtrip('length', unix)))
+
+    def test_requests_are_batched(self, monkeypatch):
+        from coinaddr import batch
+
+        sizes = []
+        validate_batch = batch.validate_batch
+
+        def recording(pairs):
+            pairs = list(pairs)
+            sizes.append(len(pairs))
+            return validate_batch(pairs)
+
+        monkeypatch.setattr(batch, 'validate_batch', recording)
+        _check(asyncio.run(_roundtrip('lines', _tcp)))
+        assert sum(sizes) == 4
+        assert max(sizes) > 1
+
+    def test_oversized_length_message_closes(self):
+        async def run():
+            server = Server(framing='length', max_message=64)
+            listener, reader, writer = await _tcp(server)
+            async with listener:
+                writer.write(struct.pack('>I', 2 ** 31) + b'btc\t1')
+                await writer.drain()
+                size, = struct.unpack('>I', await reader.readexactly(4))
+                reply = await reader.readexactly(size)
+                rest = await reader.read()
+                writer.close()
+            return reply, rest
+
+        reply, rest = asyncio.run(run())
+        assert reply.startswith(b'E\t')
+        assert rest == b''
+
+    def test_default_rejects_long_addresses(self):
+        async def run():
+            listener, reader, writer = await _tcp(Server())
+            async with listener:
+                writer.write(b'btc\t1' + b'z' * 1000 + b'\n')
+                await writer.drain()
+                reply = await reader.readline()
+                writer.close()
+            return reply
+
+        assert asyncio.run(run()).startswith(b'E\t')
+
+    def test_oversized_line_closes(self):
+        async def run():
+            server = Server(max_message=64)
+            listener, reader, writer = await _tcp(server)
+            async with listener:
+                writer.write(b'btc\t' + b'1' * 200 + b'\n')
+                await writer.drain()
+                reply = await reader.readline()
+                rest = await reader.read()
+                writer.close()
+            return reply, rest
+
+        reply, rest = asyncio.run(run())
+        assert reply.startswith(b'E\t')
+        assert rest == b''
+
+    def test_cancelled_handler_exits_cleanly(self):
+        async def run():
+            server = Server()
+            listener, reader, writer = await _tcp(server)
+            async with listener:
+                writer.write(REQUESTS[0] + b'\n')
+                await writer.drain()
+                await reader.readline()
+                handlers = [
+                    task for task in asyncio.all_tasks()
+                    if task.get_coro().__qualname__ == 'Server.handle']
+                for task in handlers:
+                    task.cancel()
+                results = await asyncio.gather(
+                    *handlers, return_exceptions=True)
+                writer.close()
+            return results
+
+        results = asyncio.run(run())
+        assert results
+        assert not any(
+            isinstance(result, BaseException) for result in results)
+
+    def test_validator_errors_fail_one_request(self):
+        @implementer(IValidator)
+        class ServerRaisingValidator(ValidatorBase):
+            name = 'ServerRaising'
+
+            def validate(self):
+                if self.request.address == b'boom':
+                    raise RuntimeError('validator failed')
+                return True
+
+            @property
+            def network(self):
+                return 'main'
+
+        Currency('serverraisingcoin', ticker='src',
+                 validator='ServerRaising')
+
+        async def run():
+            server = Server(window=0.05)
+            listener, reader, writer = await _tcp(server)
+            async with listener:
+                writer.write(
+                    b'src\tgood\nsrc\tboom\nbtc\t' + REQUESTS[0][4:] + b'\n')
+                await writer.drain()
+                replies = [await reader.readline() for _ in range(3)]
+                writer.close()
+            return replies
+
+        replies = asyncio.run(run())
+        assert replies[0] == b'1\tmain\n'
+        assert replies[1] == b'E\tvalidator failed\n'
+        assert replies[2] == b'1\tmain\n'
+
+    def test_pipelining_is_bounded(self):
+        async def run():
+            server = Server(window=0.2, max_pending=2)
+            listener, reader, writer = await _tcp(server)
+            async with listener:
+                writer.write((REQUESTS[0] + b'\n') * 10)
+                await writer.drain()
+                await asyncio.sleep(0.05)
+                pending = len(server.batcher._pending)
+                replies = [await reader.readline() for _ in range(10)]
+                writer.close()
+            return pending, replies
+
+        pending, replies = asyncio.run(run())
+        assert pending == 4
+        assert replies == [b'1\tmain\n'] * 10
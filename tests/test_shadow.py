@@ -0,0 +1,98 @@
+import pytest
+
+import coinaddr
+from coinaddr import corpus, shadow
+from coinaddr.validation import EthereumValidator
+
+
+@pytest.fixture
+def pairs():
+    return [
+        (sample.currency, sample.address)
+        for sample in corpus.generate_all(20, seed=6)
+    ]
+
+
+class TestShadow:
+    def teardown_method(self):
+        shadow.disable()
+
+    def test_kernels_agree_with_reference(self, pairs):
+        monitor = shadow.enable(rate=1.0)
+        coinaddr.validate_batch(pairs)
+
+        assert monitor.checked == len(pairs)
+        assert monitor.mismatches == 0
+        assert monitor.records == []
+
+    def test_sampling_rate(self, pairs):
+        monitor = shadow.enable(rate=0.1, seed=1)
+        for _ in range(20):
+            coinaddr.validate_batch(pairs)
+
+        expected = 0.1 * 20 * len(pairs)
+        assert 0.5 * expected < monitor.checked < 1.5 * expected
+
+    def test_records_mismatches(self, pairs, monkeypatch):
+        monkeypatch.setattr(
+            EthereumValidator, 'validate_batch',
+            classmethod(lambda cls, addresses, plan: [
+                (True, 'both') for _ in addresses]))
+        seen = []
+        monitor = shadow.enable(
+            rate=1.0, max_records=2, on_mismatch=seen.append)
+        coinaddr.validate_batch(pairs)
+
+        invalid = [
+            address for name, address in pairs
+            if name.startswith('eth') and not coinaddr.is_valid(name, address)
+        ]
+        assert monitor.mismatches == len(invalid) == len(seen)
+        assert len(monitor.records) == 2
+        assert monitor.records[0].result == (True, 'both')
+        assert monitor.records[0].expected == (False, 'both')
+
+    def test_disabled(self, pairs):
+        assert shadow.disable() is None
+        coinaddr.validate_batch(pairs)
+
+    def test_reference_is_independent_of_fast_path(self, pairs, monkeypatch):
+        from coinaddr import validation
+
+        def broken_decode(address, extras):
+            raise ValueError('broken')
+
+        monkeypatch.setattr(validation, '_b58decode', broken_decode)
+        monkeypatch.setattr(
+            EthereumValidator, '_validate',
+            classmethod(lambda cls, address: True))
+        monitor = shadow.enable(rate=1.0)
+        results = coinaddr.validate_batch(pairs)
+
+        wrong = sum(
+            (result.valid, result.network) != shadow.reference(
+                validation.currency.Currencies.get(name), address)
+            for (name, address), result in zip(pairs, results))
+        assert wrong > 0
+        assert monitor.mismatches == wrong
+
+    def test_per_request_paths_are_shadowed(self, monkeypatch):
+        from coinaddr import validation
+
+        def broken_decode(address, extras):
+            raise ValueError('broken')
+
+        monkeypatch.setattr(validation, '_b58decode', broken_decode)
+        monitor = shadow.enable(rate=1.0)
+        address = b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT'
+
+        assert not coinaddr.validate('btc', address).valid
+        assert not coinaddr.validate('btc', address, lazy=True).valid
+        assert not coinaddr.is_valid('btc', address)
+
+        assert monitor.checked == 3
+        assert monitor.mismatches == 3
+        assert [record.result for record in monitor.records] == [
+            (False, ''), (False, None), (False, None)]
+        assert monitor.records[0].expected == (True, 'main')
+        assert monitor.records[1].expected == (True, None)
@@ -0,0 +1,102 @@
+import pytest
+
+import coinaddr
+from coinaddr import tracing, validation
+
+
+class TestTracing:
+    def test_hook_receives_stages(self):
+        events = []
+
+        def hook(stage, elapsed):
+            events.append((stage, elapsed))
+
+        tracing.add_hook(hook)
+        try:
+            coinaddr.validate('btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT')
+            coinaddr.validate(
+                'btc-segwit', b'bc1q9yl05qdyz7gvtnmrrrjc0x48q3dpq44vx5p9kz')
+            coinaddr.validate(
+                'eth', b'0x154985aD8A10AFe32bdF9CE08b8b9dcD082Db34d')
+        finally:
+            tracing.remove_hook(hook)
+
+        assert {stage for stage, _ in events} == set(tracing.STAGES)
+        assert all(elapsed >= 0 for _, elapsed in events)
+
+    def test_uninstrumented_when_disabled(self):
+        original = validation._b58decode
+        with tracing.SamplingTracer(rate=1.0):
+            assert validation._b58decode is not original
+        assert validation._b58decode is original
+
+    def test_sampling_tracer_aggregates(self):
+        with tracing.SamplingTracer(rate=1.0) as tracer:
+            for _ in range(3):
+                coinaddr.validate('btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT')
+
+        stats = tracer.stats()
+        assert stats[tracing.DOUBLE_SHA256].count == 3
+        assert stats[tracing.RESULT].count == 3
+        assert stats[tracing.KECCAK].count == 0
+        assert stats[tracing.DOUBLE_SHA256].mean_ns > 0
+
+        tracer.reset()
+        assert tracer.stats()[tracing.RESULT].count == 0
+
+    def test_stages_do_not_nest(self):
+        with tracing.SamplingTracer(rate=1.0) as tracer:
+            coinaddr.validate('btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT')
+
+        stats = tracer.stats()
+        assert stats[tracing.BASE58_DECODE].count == 1
+        assert stats[tracing.NETWORK].count == 1
+
+    def test_batch_results_are_traced(self):
+        pairs = [
+            ('btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT'),
+            ('eth', b'0x154985aD8A10AFe32bdF9CE08b8b9dcD082Db34d'),
+            ('btc-segwit', b'bc1q9yl05qdyz7gvtnmrrrjc0x48q3dpq44vx5p9kz'),
+        ]
+        with tracing.SamplingTracer(rate=1.0) as tracer:
+            coinaddr.validate_batch(pairs)
+
+        stats = tracer.stats()
+        assert stats[tracing.RESULT].count == 3
+        assert stats[tracing.DOUBLE_SHA256].count == 1
+
+    def test_sampling_rate_bounds(self):
+        with pytest.raises(ValueError):
+            tracing.SamplingTracer(rate=0)
+        with pytest.raises(ValueError):
+            tracing.add_hook(lambda stage, elapsed: None, rate=1.5)
+
+    def test_unsampled_calls_are_not_timed(self, monkeypatch):
+        timings = []
+        perf_counter_ns = tracing.perf_counter_ns
+
+        def counting():
+            timings.append(None)
+            return perf_counter_ns()
+
+        monkeypatch.setattr(tracing, 'perf_counter_ns', counting)
+        with tracing.SamplingTracer(rate=0.1, seed=3) as tracer:
+            for _ in range(100):
+                coinaddr.validate('btc', b'1BoatSLRHtKNngkdXEeobR76b53LETtpyT')
+
+        events = sum(stats.count for stats in tracer.stats().values())
+        assert 0 < events < 250
+        assert len(timings) == 2 * events
+
+    def test_hook_errors_do_not_hide_stage_errors(self):
+        def failing(stage, elapsed):
+            raise RuntimeError('hook failed')
+
+        tracing.add_hook(failing)
+        try:
+            with pytest.raises(ValueError, match='invalid base58'):
+                validation._b58decode(b'0', {})
+            with pytest.raises(RuntimeError, match='hook failed'):
+                validation._b58decode(b'1', {})
+        finally:
+            tracing.remove_hook(failing)
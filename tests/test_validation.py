@@ -1,11 +1,13 @@
 import unittest
 
 from coinaddr.interfaces import (
-    INamedSubclassContainer, IValidator, IValidationRequest, IValidationResult
+    INamedSubclassContainer, IValidator, IBatchValidator, IValidationRequest,
+    IValidationResult
     )
 from coinaddr.validation import (
     Validators, ValidatorBase, ValidationRequest, ValidationResult,
-    Base58CheckValidator, EthereumValidator, SegWitValidator
+    Base58CheckValidator, EthereumValidator, SegWitValidator,
+    LazyValidationResult, ErrorResult
     )
 
 
@@ -17,11 +19,16 @@ class TestValidation(unittest.TestCase):
         for validator in validators:
             with self.subTest(validator=validator):
                 self.assertTrue(IValidator.implementedBy(validator))
+                self.assertTrue(IBatchValidator.providedBy(validator))
 
         self.assertTrue(
             IValidationRequest.implementedBy(ValidationRequest))
         self.assertTrue(
             IValidationResult.implementedBy(ValidationResult))
+        self.assertTrue(
+            IValidationResult.implementedBy(LazyValidationResult))
+        self.assertTrue(
+            IValidationResult.implementedBy(ErrorResult))
 
 
 if __name__ == '__main__':